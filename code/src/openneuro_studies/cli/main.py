@@ -492,12 +492,26 @@ def metadata_sync(study_ids: tuple[str, ...]) -> None:
     help="When to run validation: 'always' or 'new-commits' (skip if no changes since last validation)",
     show_default=True,
 )
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    help="Number of studies to validate in parallel (default: 1 for serial processing)",
+)
+@click.option(
+    "--native-text",
+    is_flag=True,
+    help="Run the validator a second time for its native report.txt "
+    "(default: format report.txt from the JSON report)",
+)
 def validate(
     study_ids: tuple[str, ...],
     timeout: int,
     update_tsv: bool,
     commit: bool,
     when: str,
+    workers: int,
+    native_text: bool,
 ) -> None:
     """Run BIDS validation on study datasets.
 
@@ -515,13 +529,18 @@ def validate(
         openneuro-studies validate
         openneuro-studies validate study-ds000001
         openneuro-studies validate --when=always  # Force revalidation
+        openneuro-studies validate --workers 4
     """
     from openneuro_studies.validation import (
+        VALIDATION_CACHE_FILE,
+        ValidationCache,
         ValidationStatus,
         find_validator,
+        get_validator_version,
         needs_validation,
-        run_validation,
-        update_studies_tsv_validation,
+        run_validation_batch,
+        study_content_key,
+        update_studies_tsv_validation_bulk,
     )
 
     root_path = Path(".")
@@ -573,22 +592,33 @@ def validate(
         ValidationStatus.NOT_AVAILABLE: 0,
     }
     skipped_count = 0
+    tsv_updates = {}
+
+    # Content each study was last validated at, to skip unchanged studies cheaply
+    validation_cache = ValidationCache(root_path / VALIDATION_CACHE_FILE)
+    validator_version = get_validator_version(validator_cmd)
 
+    to_validate = []
     for study_path in study_paths:
         # Check if validation is needed (--when option)
-        if when.lower() == "new-commits" and not needs_validation(study_path):
+        if when.lower() == "new-commits" and not needs_validation(
+            study_path, cache=validation_cache, validator_version=validator_version
+        ):
             click.echo(f"\n  {study_path.name}: skipped (no changes)")
             skipped_count += 1
             continue
-
+        to_validate.append(study_path)
+
+    validations = run_validation_batch(
+        to_validate,
+        validator_cmd=validator_cmd,
+        timeout=timeout,
+        max_workers=workers,
+        native_text=native_text,
+    )
+    for study_path, result in validations:
         click.echo(f"\n  Validating {study_path.name}...", nl=False)
 
-        result = run_validation(
-            study_path,
-            validator_cmd=validator_cmd,
-            timeout=timeout,
-        )
-
         results_summary[result.status] += 1
 
         # Display result
@@ -609,11 +639,22 @@ def validate(
         else:
             click.echo(f" {icon} n/a")
 
-        # Update studies.tsv
-        if update_tsv:
-            studies_tsv = root_path / "studies.tsv"
-            if studies_tsv.exists():
-                update_studies_tsv_validation(studies_tsv, study_path.name, result.status)
+        tsv_updates[study_path.name] = result.status
+
+        if result.status != ValidationStatus.NOT_AVAILABLE:
+            content_key = study_content_key(study_path)
+            if content_key is not None:
+                validation_cache.record(
+                    study_path.name, content_key, result.validator_version, result.status
+                )
+
+    validation_cache.save()
+
+    # Update studies.tsv once for all validated studies
+    if update_tsv:
+        studies_tsv = root_path / "studies.tsv"
+        if studies_tsv.exists():
+            update_studies_tsv_validation_bulk(studies_tsv, tsv_updates)
 
     # Summary
     click.echo("\n" + "=" * 60)
@@ -19,6 +19,7 @@ from openneuro_studies.models import (
 from openneuro_studies.organization import OrganizationError, organize_study
 from openneuro_studies.organization.unorganized_tracker import (
     add_unorganized_dataset,
+    flush_unorganized_commits,
     get_unorganized_summary,
 )
 
@@ -254,7 +255,10 @@ def organize(
                         reason=UnorganizedReason.ORGANIZATION_ERROR,
                         notes=str(error),
                     )
-                    add_unorganized_dataset(unorganized, config_dir)
+                    add_unorganized_dataset(unorganized, config_dir, defer_commit=True)
+
+        # Commit all tracked unorganized datasets at once
+        flush_unorganized_commits()
 
         # Commit all organized studies to parent repository in a single batch operation
         # This avoids git index.lock conflicts from parallel workers
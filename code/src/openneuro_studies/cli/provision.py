@@ -7,7 +7,7 @@ import click
 
 from openneuro_studies.provision import (
     needs_provisioning,
-    provision_study,
+    provision_studies,
 )
 
 logger = logging.getLogger(__name__)
@@ -37,6 +37,13 @@ logger = logging.getLogger(__name__)
     help="When to provision: 'always' (all studies) or 'outdated' (only outdated versions)",
     show_default=True,
 )
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    help="Number of studies to provision in parallel, each running copier in its own "
+    "subprocess (default: 1 for serial processing)",
+)
 @click.pass_context
 def provision(
     ctx: click.Context,
@@ -45,6 +52,7 @@ def provision(
     dry_run: bool,
     commit: bool,
     when: str,
+    workers: int,
 ) -> None:
     """Provision study datasets with templated content.
 
@@ -71,6 +79,9 @@ def provision(
 
         # Preview changes
         openneuro-studies provision --dry-run
+
+        # Provision with 8 parallel workers
+        openneuro-studies provision --workers 8
     """
     # --when=always implies --force
     if when.lower() == "always":
@@ -110,9 +121,7 @@ def provision(
     skipped_count = 0
     error_count = 0
 
-    for study_path in study_paths:
-        result = provision_study(study_path, force=force, dry_run=dry_run)
-
+    for result in provision_studies(study_paths, force=force, dry_run=dry_run, workers=workers):
         if result.error and "Already up-to-date" in result.error:
             click.echo(f"  {result.study_id}: skipped (up-to-date)")
             skipped_count += 1
@@ -1,7 +1,9 @@
 """CLI command for publishing study repositories to GitHub."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 import click
 
@@ -55,6 +57,13 @@ logger = logging.getLogger(__name__)
     help="Use datalad push --since for efficient incremental push. "
     'Use "^" for last pushed state or a git ref (branch/tag/commit).',
 )
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    envvar="OPENNEURO_STUDIES_PUBLISH_WORKERS",
+    help="Number of parallel workers for publishing studies (default: 1 for serial processing)",
+)
 @click.pass_context
 def publish(
     ctx: click.Context,
@@ -65,6 +74,7 @@ def publish(
     sync: bool,
     dry_run: bool,
     since: str | None,
+    workers: int,
 ) -> None:
     """Publish study repositories to GitHub.
 
@@ -78,6 +88,7 @@ def publish(
     Environment Variables:
         GITHUB_TOKEN: GitHub personal access token (required)
         OPENNEURO_STUDIES_GITHUB_ORG: GitHub organization (default: OpenNeuroStudies)
+        OPENNEURO_STUDIES_PUBLISH_WORKERS: Number of parallel workers (default: 1)
 
     Examples:
         # Publish all studies
@@ -86,6 +97,9 @@ def publish(
         # Publish specific studies
         openneuro-studies publish study-ds000001 study-ds005256
 
+        # Publish with 8 parallel workers
+        openneuro-studies publish --workers 8
+
         # Force push to overwrite remote
         openneuro-studies publish --force study-ds000001
 
@@ -117,7 +131,13 @@ def publish(
             return
 
         try:
-            result = sync_publication_status(token, organization, tracker.status)
+            # Stop listing once every local study has been seen on GitHub
+            local_studies = {
+                p.name for p in Path(".").iterdir() if p.is_dir() and p.name.startswith("study-")
+            }
+            result = sync_publication_status(
+                token, organization, tracker.status, expected_names=local_studies
+            )
             click.echo(str(result))
 
             # Save updated status
@@ -211,6 +231,13 @@ def publish(
 
     click.echo(f"Publishing {len(studies_to_publish)} studies to {organization}...")
 
+    # One paginated listing answers every per-study existence/HEAD lookup
+    if len(studies_to_publish) > 1:
+        try:
+            publisher.prime_repo_cache()
+        except PublishError as e:
+            raise click.ClickException(str(e)) from e
+
     if dry_run:
         click.echo("[DRY RUN] Would publish the following studies:")
         for study_path in studies_to_publish:
@@ -218,35 +245,62 @@ def publish(
             click.echo(f"  - {study_path.name} ({status})")
         return
 
-    # Publish each study
+    # Workers read this snapshot rather than the tracker, which mark_published()
+    # mutates on the main thread while they run
+    pushed_shas = {s.study_id: s.last_push_commit_sha for s in tracker.status.studies}
+
+    def publish_single(
+        study_path: Path,
+    ) -> tuple[str, Optional[tuple[str, str, bool]], Optional[PublishError]]:
+        """Publish one study; returns (note, publish result or None if up-to-date, error)."""
+        study_id = study_path.name
+        note = ""
+        local_sha = None
+        try:
+            # Check if already up-to-date (compare local HEAD with tracked SHA)
+            if not force and study_id in pushed_shas:
+                local_sha = publisher.get_local_head_sha(study_path)
+                # Skip only if local HEAD matches what we last pushed
+                if local_sha == pushed_shas[study_id]:
+                    # Also verify remote has this commit (detect push failures)
+                    remote_sha = publisher.get_remote_head_sha(study_id)
+                    if remote_sha == local_sha:
+                        return (note, None, None)
+                    # Local matches tracking but remote doesn't - push failed previously
+                    note = (
+                        f" remote out of sync (local={local_sha[:8]}, "
+                        f"remote={remote_sha[:8] if remote_sha else 'empty'}), pushing..."
+                    )
+
+            published = publisher.publish_study(study_path, force=force, local_sha=local_sha)
+            return (note, published, None)
+        except PublishError as e:
+            logger.error(f"Failed to publish {study_id}: {e}")
+            return (note, None, e)
+
+    # Publish each study; executor.map keeps output in input order while
+    # pushes and API round-trips of different studies overlap
     published_count = 0
     created_count = 0
     updated_count = 0
     failed_count = 0
 
-    for study_path in studies_to_publish:
-        study_id = study_path.name
+    # The tracker saves and commits all marked studies once, on leaving the block
+    with tracker, ThreadPoolExecutor(max_workers=workers) as executor:
+        outcomes = executor.map(publish_single, studies_to_publish)
+        for study_path, (note, published, error) in zip(studies_to_publish, outcomes, strict=True):
+            study_id = study_path.name
+            click.echo(f"\nPublishing {study_id}...{note}", nl=False)
 
-        try:
-            click.echo(f"\nPublishing {study_id}...", nl=False)
+            if error is not None:
+                click.echo(f" FAILED: {error}", err=True)
+                failed_count += 1
+                continue
+            if published is None:
+                click.echo(" already up-to-date")
+                continue
 
-            # Check if already up-to-date (compare local HEAD with tracked SHA)
-            if not force and tracker.is_published(study_id):
-                tracked_study = tracker.status.get_study(study_id)
-                if tracked_study:
-                    local_sha = publisher.get_local_head_sha(study_path)
-                    # Skip only if local HEAD matches what we last pushed
-                    if local_sha == tracked_study.last_push_commit_sha:
-                        # Also verify remote has this commit (detect push failures)
-                        remote_sha = publisher.get_remote_head_sha(study_id)
-                        if remote_sha == local_sha:
-                            click.echo(" already up-to-date")
-                            continue
-                        else:
-                            # Local matches tracking but remote doesn't - push failed previously
-                            click.echo(f" remote out of sync (local={local_sha[:8]}, remote={remote_sha[:8] if remote_sha else 'empty'}), pushing...")
-
-            github_url, commit_sha, was_created = publisher.publish_study(study_path, force=force)
+            github_url, commit_sha, was_created = published
 
             # Update tracking
             tracker.mark_published(study_id, github_url, commit_sha)
@@ -260,14 +314,8 @@ def publish(
 
             published_count += 1
 
-        except PublishError as e:
-            click.echo(f" FAILED: {e}", err=True)
-            failed_count += 1
-            logger.error(f"Failed to publish {study_id}: {e}")
-
-    # Save publication status (only if at least one study succeeded)
+    # Publication status was saved above (only if at least one study succeeded)
     if published_count > 0:
-        tracker.save(commit=True)
         click.echo(f"\n✓ Saved publication tracking to {config_dir}/published-studies.json")
     elif failed_count > 0:
         click.echo(f"\n✗ No changes saved (all {failed_count} publications failed)", err=True)
@@ -304,7 +352,7 @@ def publish(
 
     except subprocess.CalledProcessError as e:
         # Handle case where upstream branch doesn't exist or other errors
-        stderr = e.stderr if hasattr(e, 'stderr') else str(e)
+        stderr = e.stderr if hasattr(e, "stderr") else str(e)
         if "no upstream" in stderr.lower() or "upstream branch" in stderr.lower():
             click.echo("⚠ No upstream branch configured, attempting push anyway...")
             try:
@@ -317,7 +365,9 @@ def publish(
                 )
                 click.echo("✓ Parent repository pushed to origin")
             except subprocess.CalledProcessError as push_error:
-                click.echo(f"⚠ Warning: Failed to push parent repository: {push_error.stderr}", err=True)
+                click.echo(
+                    f"⚠ Warning: Failed to push parent repository: {push_error.stderr}", err=True
+                )
                 click.echo("  You may need to manually run: git push origin HEAD")
         else:
             click.echo(f"⚠ Warning: Could not check parent repository status: {stderr}", err=True)
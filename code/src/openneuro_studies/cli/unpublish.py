@@ -126,25 +126,23 @@ def unpublish(
     deleted_count = 0
     failed_count = 0
 
-    for study_id in studies_to_delete:
-        try:
-            click.echo(f"Deleting {study_id}...", nl=False)
-            publisher.delete_repository(study_id)
-
-            # Remove from tracking
-            tracker.mark_unpublished(study_id)
-
-            click.echo(" deleted")
-            deleted_count += 1
-
-        except PublishError as e:
-            click.echo(f" FAILED: {e}", err=True)
-            failed_count += 1
-            logger.error(f"Failed to delete {study_id}: {e}")
-
-    # Save updated tracking
-    if deleted_count > 0:
-        tracker.save(commit=True)
+    # The tracker saves and commits all removals once, on leaving the block
+    with tracker:
+        for study_id in studies_to_delete:
+            try:
+                click.echo(f"Deleting {study_id}...", nl=False)
+                publisher.delete_repository(study_id)
+
+                # Remove from tracking
+                tracker.mark_unpublished(study_id)
+
+                click.echo(" deleted")
+                deleted_count += 1
+
+            except PublishError as e:
+                click.echo(f" FAILED: {e}", err=True)
+                failed_count += 1
+                logger.error(f"Failed to delete {study_id}: {e}")
 
     # Summary
     click.echo(f"\n{'='*60}")
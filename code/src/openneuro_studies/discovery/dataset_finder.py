@@ -653,9 +653,14 @@ class DatasetFinder:
             SourceDataset or DerivativeDataset instance, or None if processing fails
         """
         try:
-            # Use default_branch from listing response (avoids extra /repos/{owner}/{repo} call)
-            default_branch = repo.get("default_branch", "main")
-            commit_sha = self.github_client.get_branch_sha(org_name, repo["name"], default_branch)
+            # The GraphQL listing already carries the HEAD SHA; otherwise use default_branch
+            # from the listing response (avoids extra /repos/{owner}/{repo} call)
+            commit_sha = repo.get("default_branch_sha")
+            if not commit_sha:
+                default_branch = repo.get("default_branch", "main")
+                commit_sha = self.github_client.get_branch_sha(
+                    org_name, repo["name"], default_branch
+                )
 
             # Fetch dataset_description.json once
             try:
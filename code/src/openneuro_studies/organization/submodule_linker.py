@@ -79,7 +79,6 @@ def link_submodule(
                 ],
                 check=True,
                 capture_output=True,
-                text=True,
             )
 
             # Configure .gitmodules - url
@@ -96,7 +95,6 @@ def link_submodule(
                 ],
                 check=True,
                 capture_output=True,
-                text=True,
             )
 
             # Add DataLad-specific fields if provided
@@ -115,7 +113,6 @@ def link_submodule(
                     ],
                     check=True,
                     capture_output=True,
-                    text=True,
                 )
 
                 # datalad-url (same as url for GitHub datasets)
@@ -132,7 +129,6 @@ def link_submodule(
                     ],
                     check=True,
                     capture_output=True,
-                    text=True,
                 )
 
             # 3. Stage .gitmodules
@@ -140,7 +136,6 @@ def link_submodule(
                 ["git", "-C", str(parent_repo), "add", ".gitmodules"],
                 check=True,
                 capture_output=True,
-                text=True,
             )
 
             # 4. Add gitlink with specific commit SHA
@@ -157,13 +152,13 @@ def link_submodule(
                 ],
                 check=True,
                 capture_output=True,
-                text=True,
             )
 
         except subprocess.CalledProcessError as e:
+            # Output is captured as bytes; decode only on failure
+            err = e.stderr.decode("utf-8", "replace") if e.stderr else str(e)
             raise SubmoduleLinkError(
-                f"Failed to link submodule {submodule_name} at {submodule_path}: "
-                f"{e.stderr if e.stderr else str(e)}"
+                f"Failed to link submodule {submodule_name} at {submodule_path}: {err}"
             ) from e
         except Exception as e:
             raise SubmoduleLinkError(
@@ -200,7 +195,6 @@ def is_submodule_linked(parent_repo: Path, submodule_path: str) -> bool:
                 submodule_path,
             ],
             capture_output=True,
-            text=True,
             check=False,  # Don't raise on non-zero exit (means not found)
         )
         return result.returncode == 0
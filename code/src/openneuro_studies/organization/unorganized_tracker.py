@@ -2,8 +2,10 @@
 
 import json
 import logging
+from collections import Counter
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Set
 
 import datalad.api as dl
 
@@ -11,6 +13,28 @@ from openneuro_studies.models import UnorganizedDataset
 
 logger = logging.getLogger(__name__)
 
+# Files written with defer_commit=True, awaiting a single flush_unorganized_commits()
+_PENDING_SAVES: Set[Path] = set()
+
+
+def _load_unorganized_entries(config_dir: Path) -> List[Dict[str, Any]]:
+    """Load raw (unvalidated) entries from unorganized-datasets.json.
+
+    Args:
+        config_dir: Configuration directory containing unorganized-datasets.json
+
+    Returns:
+        List of JSON-serialized UnorganizedDataset dictionaries
+    """
+    try:
+        with open(config_dir / "unorganized-datasets.json") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return []
+
+    entries: List[Dict[str, Any]] = data.get("unorganized", [])
+    return entries
+
 
 def load_unorganized_datasets(
     config_dir: Path = Path(".openneuro-studies"),
@@ -23,99 +47,159 @@ def load_unorganized_datasets(
     Returns:
         List of UnorganizedDataset instances
     """
-    unorganized_file = config_dir / "unorganized-datasets.json"
-    if not unorganized_file.exists():
-        return []
-
-    with open(unorganized_file) as f:
-        data = json.load(f)
-
-    return [UnorganizedDataset(**item) for item in data.get("unorganized", [])]
+    return [UnorganizedDataset(**item) for item in _load_unorganized_entries(config_dir)]
 
 
 def save_unorganized_datasets(
     unorganized: List[UnorganizedDataset],
     config_dir: Path = Path(".openneuro-studies"),
     commit: bool = True,
+    defer_commit: bool = False,
 ) -> None:
     """Save unorganized datasets to JSON file.
 
     Datasets are sorted by dataset_id (primary) and url (secondary) for
-    deterministic output (FR-038).
+    deterministic output (FR-038). If the serialized content matches the
+    existing file, neither the file nor the subdataset is touched.
 
     Args:
         unorganized: List of UnorganizedDataset instances to save
         config_dir: Configuration directory for output file
         commit: Whether to commit changes to .openneuro-studies subdataset (default: True)
+        defer_commit: Queue the file for a later flush_unorganized_commits() call
+            instead of running datalad save now (default: False)
+    """
+    # Sort by dataset_id, then url (FR-038)
+    unorganized_sorted = sorted(unorganized, key=attrgetter("dataset_id", "url"))
+    _save_unorganized_entries(
+        [u.model_dump(mode="json") for u in unorganized_sorted],
+        config_dir,
+        commit=commit,
+        defer_commit=defer_commit,
+    )
+
+
+def _save_unorganized_entries(
+    entries: List[Dict[str, Any]],
+    config_dir: Path,
+    commit: bool = True,
+    defer_commit: bool = False,
+) -> None:
+    """Write already-serialized, sorted entries and commit them.
+
+    Args:
+        entries: JSON-serialized UnorganizedDataset dictionaries, sorted (FR-038)
+        config_dir: Configuration directory for output file
+        commit: Whether to commit changes to .openneuro-studies subdataset
+        defer_commit: Queue the file for flush_unorganized_commits() instead
     """
     config_dir.mkdir(parents=True, exist_ok=True)
     unorganized_file = config_dir / "unorganized-datasets.json"
 
-    # Sort by dataset_id, then url (FR-038)
-    unorganized_sorted = sorted(unorganized, key=lambda d: (d.dataset_id, d.url))
-
-    # Convert to serializable format
     data = {
-        "unorganized": [u.model_dump(mode="json") for u in unorganized_sorted],
-        "count": len(unorganized_sorted),
+        "unorganized": entries,
+        "count": len(entries),
     }
 
-    with open(unorganized_file, "w") as f:
-        json.dump(data, f, indent=2)
+    content = json.dumps(data, indent=2)
+
+    # Skip both the write and the commit when nothing changed
+    try:
+        if unorganized_file.read_text() == content:
+            logger.debug("unorganized-datasets.json unchanged, skipping save")
+            return
+    except FileNotFoundError:
+        pass
+
+    unorganized_file.write_text(content)
+
+    if not commit:
+        return
+
+    if defer_commit:
+        _PENDING_SAVES.add(unorganized_file.resolve())
+        return
 
     # Commit to .openneuro-studies subdataset (FR-020a)
     # Use datalad save from top dataset - it will figure out which subdataset changed
-    if commit:
-        try:
-            unorganized_file_abs = unorganized_file.resolve()
-            dl.save(
-                dataset="^",
-                path=str(unorganized_file_abs),
-                message=f"Update unorganized datasets\n\n"
-                f"Tracked {len(unorganized_sorted)} unorganized datasets\n"
-                f"Updated by openneuro-studies organize command",
-            )
-            logger.info("Committed unorganized-datasets.json to .openneuro-studies subdataset")
-        except Exception as e:
-            logger.warning(f"Failed to commit unorganized-datasets.json: {e}")
+    try:
+        unorganized_file_abs = unorganized_file.resolve()
+        dl.save(
+            dataset="^",
+            path=str(unorganized_file_abs),
+            message=f"Update unorganized datasets\n\n"
+            f"Tracked {len(entries)} unorganized datasets\n"
+            f"Updated by openneuro-studies organize command",
+        )
+        logger.info("Committed unorganized-datasets.json to .openneuro-studies subdataset")
+    except Exception as e:
+        logger.warning(f"Failed to commit unorganized-datasets.json: {e}")
+
+
+def flush_unorganized_commits(message: str = "Update unorganized datasets") -> None:
+    """Commit all files queued by save_unorganized_datasets(defer_commit=True).
+
+    Runs a single datalad save for every pending file so that repeated
+    additions during one organize run produce one commit instead of many.
+
+    Args:
+        message: Commit message
+    """
+    if not _PENDING_SAVES:
+        return
+
+    paths = sorted(str(p) for p in _PENDING_SAVES)
+    try:
+        dl.save(
+            dataset="^",
+            path=paths,
+            message=f"{message}\n\nUpdated by openneuro-studies organize command",
+        )
+        logger.info("Committed unorganized-datasets.json to .openneuro-studies subdataset")
+    except Exception as e:
+        logger.warning(f"Failed to commit unorganized-datasets.json: {e}")
+    finally:
+        _PENDING_SAVES.clear()
 
 
 def add_unorganized_dataset(
     dataset: UnorganizedDataset,
     config_dir: Path = Path(".openneuro-studies"),
+    defer_commit: bool = False,
 ) -> None:
     """Add a dataset to the unorganized tracking file.
 
     Loads existing unorganized datasets, appends the new one (avoiding duplicates
-    by dataset_id), and saves back to file.
+    by dataset_id), and saves back to file. Existing entries are kept in their
+    serialized form, so only the new dataset goes through model_dump().
 
     Args:
         dataset: UnorganizedDataset to track
         config_dir: Configuration directory
+        defer_commit: Defer the datalad save to flush_unorganized_commits()
     """
-    existing = load_unorganized_datasets(config_dir)
+    entries = _load_unorganized_entries(config_dir)
 
     # Check if dataset already tracked (by dataset_id)
-    existing_ids = {u.dataset_id for u in existing}
-    if dataset.dataset_id not in existing_ids:
-        existing.append(dataset)
-        save_unorganized_datasets(existing, config_dir)
+    if any(item["dataset_id"] == dataset.dataset_id for item in entries):
+        return
+
+    entries.append(dataset.model_dump(mode="json"))
+    # Sort by dataset_id, then url (FR-038)
+    entries.sort(key=itemgetter("dataset_id", "url"))
+    _save_unorganized_entries(entries, config_dir, defer_commit=defer_commit)
 
 
 def get_unorganized_summary(config_dir: Path = Path(".openneuro-studies")) -> Dict[str, int]:
     """Get summary counts of unorganized datasets by reason.
 
+    Reads reason codes straight from the JSON file; building full
+    UnorganizedDataset models is unnecessary for counting.
+
     Args:
         config_dir: Configuration directory
 
     Returns:
         Dictionary mapping reason codes to counts
     """
-    unorganized = load_unorganized_datasets(config_dir)
-    summary: Dict[str, int] = {}
-
-    for dataset in unorganized:
-        reason = dataset.reason.value
-        summary[reason] = summary.get(reason, 0) + 1
-
-    return summary
+    return dict(Counter(item["reason"] for item in _load_unorganized_entries(config_dir)))
@@ -9,6 +9,7 @@ from openneuro_studies.provision.provisioner import (
     TEMPLATE_VERSION_FILE,
     ProvisionResult,
     needs_provisioning,
+    provision_studies,
     provision_study,
 )
 
@@ -18,4 +19,5 @@ __all__ = [
     "ProvisionResult",
     "needs_provisioning",
     "provision_study",
+    "provision_studies",
 ]
@@ -8,16 +8,31 @@ Provisions study datasets with templated content:
 Uses copier templates from templates/study/ directory.
 """
 
+import functools
 import logging
+import os
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 logger = logging.getLogger(__name__)
 
+# Prefer copier's Python API (no interpreter startup per study) for serial runs.
+# It changes the process working directory while it runs (VCS checks via
+# plumbum's local.cwd), so parallel runs use the copier CLI in subprocesses,
+# which is also the fallback for environments without the package.
+try:
+    import copier
+
+    COPIER_AVAILABLE = True
+except ImportError:
+    COPIER_AVAILABLE = False
+    copier = None  # type: ignore[assignment]
+
 # Directory and file to track template version in provisioned studies
 # Using .openneuro-studies/ directory allows for future extensibility
 TEMPLATE_VERSION_DIR = ".openneuro-studies"
@@ -25,12 +40,24 @@ TEMPLATE_VERSION_FILE = ".openneuro-studies/template-version"
 
 # Current template version (increment when template changes)
 TEMPLATE_VERSION = "1.2.0"
+_TEMPLATE_VERSION_BYTES = TEMPLATE_VERSION.encode("utf-8")
 
 # Path to copier template (relative to this module)
 TEMPLATE_DIR = Path(__file__).parent / "templates" / "study"
+_TEMPLATE_SRC = str(TEMPLATE_DIR)
+
+# copier CLI arguments shared by every fallback invocation
+_COPIER_COPY_ARGS = ("copy", "--force")  # --force: overwrite existing files
+
+# Files rendered from the template, relative to the study directory
+_TEMPLATED_FILES = (
+    "code/run-bids-validator",
+    "README.md",
+    TEMPLATE_VERSION_FILE,
+)
 
 
-@dataclass
+@dataclass(slots=True)
 class ProvisionResult:
     """Result of provisioning a study."""
 
@@ -51,10 +78,61 @@ def get_template_version(study_path: Path) -> Optional[str]:
     Returns:
         Version string or None if not provisioned
     """
-    version_file = study_path / TEMPLATE_VERSION_FILE
-    if version_file.exists():
-        return version_file.read_text().strip()
-    return None
+    try:
+        with open(os.path.join(study_path, TEMPLATE_VERSION_FILE), "rb") as f:
+            return f.read().decode("utf-8").strip()
+    except FileNotFoundError:
+        return None
+
+
+def _snapshot_present(study_path: Path) -> set[str]:
+    """List templated files already present in a study.
+
+    Scans the study root and the template subdirectories once each with
+    os.scandir instead of stat()ing every templated file separately.
+
+    Args:
+        study_path: Path to study directory
+
+    Returns:
+        Set of present file paths relative to study_path (e.g. "code/run-bids-validator")
+    """
+    spath = os.fspath(study_path)
+    present: set[str] = set()
+    for subdir in ("", "code", TEMPLATE_VERSION_DIR):
+        prefix = f"{subdir}/" if subdir else ""
+        try:
+            with os.scandir(os.path.join(spath, subdir)) as it:
+                present.update(prefix + entry.name for entry in it)
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+    return present
+
+
+def _classify_templated_files(
+    present_before: set[str],
+    present_after: Optional[set[str]] = None,
+) -> tuple[list[str], list[str]]:
+    """Split templated files into created and updated.
+
+    Args:
+        present_before: Snapshot from _snapshot_present() before provisioning
+        present_after: Snapshot after provisioning; None assumes every templated
+            file will exist (dry run)
+
+    Returns:
+        Tuple of (files_created, files_updated)
+    """
+    files_created: list[str] = []
+    files_updated: list[str] = []
+    for f in _TEMPLATED_FILES:
+        if present_after is not None and f not in present_after:
+            continue
+        if f in present_before:
+            files_updated.append(f)
+        else:
+            files_created.append(f)
+    return files_created, files_updated
 
 
 def needs_provisioning(study_path: Path, force: bool = False) -> bool:
@@ -75,22 +153,43 @@ def needs_provisioning(study_path: Path, force: bool = False) -> bool:
     if force:
         return True
 
-    current_version = get_template_version(study_path)
-    if current_version is None:
+    # A version string is a few bytes; a bounded read and a bytes comparison
+    # avoid decoding the whole file just to check for equality
+    try:
+        with open(os.path.join(study_path, TEMPLATE_VERSION_FILE), "rb") as f:
+            current_version = f.read(64).strip()
+    except FileNotFoundError:
         return True
 
     # Simple version comparison (could be more sophisticated)
-    return current_version != TEMPLATE_VERSION
+    return current_version != _TEMPLATE_VERSION_BYTES
+
 
+@functools.lru_cache(maxsize=1)
+def _resolve_copier() -> Optional[tuple[str, ...]]:
+    """Resolve the command to run the copier CLI.
 
-def _get_copier_cmd() -> list[str]:
-    """Get command to run copier.
+    Prefers copier from PATH, falls back to python -m copier. The result is
+    cached since neither changes while provisioning a batch of studies.
 
-    Prefers copier from PATH, falls back to python -m copier.
+    Returns:
+        Command prefix to run copier, or None if copier is not available
     """
-    if shutil.which("copier") is not None:
-        return ["copier"]
-    return [sys.executable, "-m", "copier"]
+    copier_path = shutil.which("copier")
+    if copier_path is not None:
+        return (copier_path,)
+
+    cmd = (sys.executable, "-m", "copier")
+    try:
+        result = subprocess.run(
+            [*cmd, "--version"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+    except OSError:
+        return None
+    return cmd if result.returncode == 0 else None
 
 
 def _run_copier(
@@ -98,6 +197,7 @@ def _run_copier(
     study_id: str,
     dataset_id: str,
     github_org: str = "OpenNeuroStudies",
+    in_process: bool = True,
 ) -> tuple[list[str], list[str]]:
     """Run copier to provision study from template.
 
@@ -106,6 +206,8 @@ def _run_copier(
         study_id: Study identifier
         dataset_id: Dataset identifier
         github_org: GitHub organization
+        in_process: Use copier's Python API if available; False runs the copier
+            CLI in a subprocess, which is safe to do from several threads
 
     Returns:
         Tuple of (files_created, files_updated)
@@ -113,54 +215,62 @@ def _run_copier(
     Raises:
         RuntimeError: If copier fails
     """
-    files_created: list[str] = []
-    files_updated: list[str] = []
-
     # Track existing files before copier runs
-    files_to_check = [
-        "code/run-bids-validator",
-        "README.md",
-        TEMPLATE_VERSION_FILE,
-    ]
-    existing_files = {f for f in files_to_check if (study_path / f).exists()}
-
-    # Run copier with answers
-    cmd = _get_copier_cmd() + [
-        "copy",
-        "--force",  # Overwrite existing files
-        "--data",
-        f"study_id={study_id}",
-        "--data",
-        f"dataset_id={dataset_id}",
-        "--data",
-        f"template_version={TEMPLATE_VERSION}",
-        "--data",
-        f"github_org={github_org}",
-        str(TEMPLATE_DIR),
-        str(study_path),
-    ]
-
-    result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-    )
-
-    if result.returncode != 0:
-        raise RuntimeError(f"copier failed: {result.stderr}")
+    existing_files = _snapshot_present(study_path)
+
+    data = {
+        "study_id": study_id,
+        "dataset_id": dataset_id,
+        "template_version": TEMPLATE_VERSION,
+        "github_org": github_org,
+    }
+
+    if in_process and COPIER_AVAILABLE:
+        try:
+            copier.run_copy(
+                _TEMPLATE_SRC,
+                study_path.absolute(),
+                data=data,
+                defaults=True,
+                overwrite=True,  # Overwrite existing files
+                quiet=True,
+            )
+        except copier.errors.CopierError as e:
+            raise RuntimeError(f"copier failed: {e}") from e
+    else:
+        copier_cmd = _resolve_copier()
+        if copier_cmd is None:
+            raise RuntimeError("copier not found (pip install copier)")
+
+        # Run copier with answers
+        cmd = [
+            *copier_cmd,
+            *_COPIER_COPY_ARGS,
+            *(arg for key, value in data.items() for arg in ("--data", f"{key}={value}")),
+            _TEMPLATE_SRC,
+            str(study_path),
+        ]
+
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+        )
+
+        if result.returncode != 0:
+            raise RuntimeError(f"copier failed: {result.stderr}")
 
     # Determine which files were created vs updated
-    for f in files_to_check:
-        if (study_path / f).exists():
-            if f in existing_files:
-                files_updated.append(f)
-            else:
-                files_created.append(f)
-
-    # Make script executable
-    script_path = study_path / "code" / "run-bids-validator"
-    if script_path.exists():
-        script_path.chmod(0o755)
+    present_files = _snapshot_present(study_path)
+    files_created, files_updated = _classify_templated_files(existing_files, present_files)
+
+    # The template script is executable, so copier applies the mode when it
+    # writes the file; chmod here only as a fallback for installs that lost the
+    # bit (copier leaves identical files untouched)
+    if "code/run-bids-validator" in present_files:
+        script_path = os.path.join(study_path, "code", "run-bids-validator")
+        if os.stat(script_path).st_mode & 0o111 != 0o111:
+            os.chmod(script_path, 0o755)
 
     return files_created, files_updated
 
@@ -170,6 +280,7 @@ def provision_study(
     force: bool = False,
     dry_run: bool = False,
     github_org: str = "OpenNeuroStudies",
+    in_process_copier: bool = True,
 ) -> ProvisionResult:
     """Provision a study dataset with templated content.
 
@@ -183,6 +294,8 @@ def provision_study(
         force: Force re-provisioning even if already up-to-date
         dry_run: Only check what would be done
         github_org: GitHub organization for links
+        in_process_copier: Run copier through its Python API (changes the
+            process working directory; use False when provisioning from threads)
 
     Returns:
         ProvisionResult with details of changes
@@ -216,17 +329,7 @@ def provision_study(
 
     if dry_run:
         # Check what would be created
-        files_to_check = [
-            "code/run-bids-validator",
-            "README.md",
-            TEMPLATE_VERSION_FILE,
-        ]
-        for file in files_to_check:
-            file_path = study_path / file
-            if file_path.exists():
-                files_updated.append(file)
-            else:
-                files_created.append(file)
+        files_created, files_updated = _classify_templated_files(_snapshot_present(study_path))
 
         return ProvisionResult(
             study_id=study_id,
@@ -237,8 +340,10 @@ def provision_study(
         )
 
     try:
-        logger.info(f"Provisioning {study_id} with copier template")
-        files_created, files_updated = _run_copier(study_path, study_id, dataset_id, github_org)
+        logger.info("Provisioning %s with copier template", study_id)
+        files_created, files_updated = _run_copier(
+            study_path, study_id, dataset_id, github_org, in_process=in_process_copier
+        )
 
         return ProvisionResult(
             study_id=study_id,
@@ -249,7 +354,7 @@ def provision_study(
         )
 
     except Exception as e:
-        logger.error(f"Failed to provision {study_id}: {e}")
+        logger.error("Failed to provision %s: %s", study_id, e)
         return ProvisionResult(
             study_id=study_id,
             provisioned=False,
@@ -258,3 +363,54 @@ def provision_study(
             template_version=TEMPLATE_VERSION,
             error=str(e),
         )
+
+
+def provision_studies(
+    study_paths: Iterable[Path],
+    force: bool = False,
+    dry_run: bool = False,
+    github_org: str = "OpenNeuroStudies",
+    workers: int = 1,
+) -> list[ProvisionResult]:
+    """Provision multiple study datasets, optionally in parallel.
+
+    Each study is provisioned independently (per-study file I/O and a copier
+    run), so studies are distributed across a thread pool. Copier's Python API
+    changes the process working directory, so parallel runs each start the
+    copier CLI in a subprocess instead (resolved once up front so workers do
+    not each probe for it), and study paths are made absolute before fanning
+    out. Serial runs use the Python API.
+
+    Args:
+        study_paths: Paths to study directories
+        force: Force re-provisioning even if already up-to-date
+        dry_run: Only check what would be done
+        github_org: GitHub organization for links
+        workers: Number of parallel workers (default: 1 for serial processing)
+
+    Returns:
+        List of ProvisionResult, in the same order as study_paths
+    """
+    study_paths = [Path(p).absolute() for p in study_paths]
+
+    # Resolve the copier CLI once for the batch, not per worker
+    if not dry_run and (workers > 1 or not COPIER_AVAILABLE):
+        if _resolve_copier() is None and COPIER_AVAILABLE:
+            logger.warning("copier CLI not found; provisioning serially via its Python API")
+            workers = 1
+
+    if workers <= 1:
+        return [
+            provision_study(p, force=force, dry_run=dry_run, github_org=github_org)
+            for p in study_paths
+        ]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                lambda p: provision_study(
+                    p, force=force, dry_run=dry_run, github_org=github_org, in_process_copier=False
+                ),
+                study_paths,
+            )
+        )
@@ -1,14 +1,29 @@
 """GitHub repository publishing using PyGithub."""
 
 import logging
+import os
 import subprocess
+import threading
 from pathlib import Path
 from typing import Optional
 
-from github import Github, GithubException, UnknownObjectException
+from github import Auth, Github, GithubException, UnknownObjectException
+from github.Organization import Organization
+from github.Repository import Repository
+
+from openneuro_studies.utils import GitHubAPIError, GitHubClient
 
 logger = logging.getLogger(__name__)
 
+# Try to import pygit2 for in-process repository reads, but don't require it
+try:
+    import pygit2
+
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
+    pygit2 = None  # type: ignore[assignment]
+
 
 def datalad_push_since(
     dataset_path: Path = Path("."),
@@ -68,6 +83,140 @@ def datalad_push_since(
         raise
 
 
+# git -c settings for pushes: pack-objects on all cores with sparse reachability
+# walks, even if user/system git config lowers them. Override with whitespace-
+# separated key=value pairs in OPENNEURO_STUDIES_PUSH_GIT_CONFIG (empty disables).
+_DEFAULT_PUSH_GIT_CONFIG = "pack.threads=0 pack.useSparse=true"
+
+
+def _push_config_args() -> list[str]:
+    """Build the ``-c key=value`` arguments for git push."""
+    settings = os.environ.get("OPENNEURO_STUDIES_PUSH_GIT_CONFIG", _DEFAULT_PUSH_GIT_CONFIG)
+    args = []
+    for setting in settings.split():
+        args.extend(["-c", setting])
+    return args
+
+
+def list_organization_repos(organization: Organization) -> dict[str, Repository]:
+    """List all repositories of an organization in one paginated sweep.
+
+    One ``get_repos()`` listing costs a request per 100 repositories, instead of
+    one ``get_repo()`` request per repository looked up.
+
+    Args:
+        organization: PyGithub Organization object
+
+    Returns:
+        Mapping of repository name to Repository object
+    """
+    return {repo.name: repo for repo in organization.get_repos()}
+
+
+def _git_probe(study_path: Path) -> tuple[str, str, str | None]:
+    """Read HEAD SHA, current branch and origin URL of a local repository.
+
+    A single ``rev-parse`` resolves both HEAD and its branch name, so the probe
+    costs two git spawns instead of one per value.
+
+    Args:
+        study_path: Path to local repository
+
+    Returns:
+        Tuple of (head_sha, branch, origin_url or None if origin is not configured)
+
+    Raises:
+        subprocess.CalledProcessError: If HEAD cannot be resolved
+    """
+    if PYGIT2_AVAILABLE:
+        probe = _pygit2_probe(study_path)
+        if probe is not None:
+            return probe
+
+    result = subprocess.run(
+        ["git", "-C", str(study_path), "rev-parse", "HEAD", "--abbrev-ref", "HEAD"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    head_sha, branch = result.stdout.split()
+    origin = subprocess.run(
+        ["git", "-C", str(study_path), "config", "--get", "remote.origin.url"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    origin_url = origin.stdout.strip() if origin.returncode == 0 else None
+    return head_sha, branch, origin_url
+
+
+def _pygit2_probe(study_path: Path) -> tuple[str, str, str | None] | None:
+    """In-process variant of _git_probe using libgit2, without spawning git.
+
+    Returns None if pygit2 cannot read the repository (e.g. unborn HEAD), so
+    that the caller falls back to git and reports its error.
+    """
+    try:
+        repo = pygit2.Repository(str(study_path))
+        head = repo.head
+    except (pygit2.GitError, KeyError):
+        return None
+    branch = "HEAD" if repo.head_is_detached else head.shorthand
+    try:
+        origin_url: str | None = repo.remotes["origin"].url
+    except KeyError:
+        origin_url = None
+    return str(head.target), branch, origin_url
+
+
+def _lease_sha(study_path: Path, branch: str, default_branch_sha: str) -> str:
+    """Resolve the ``--force-with-lease`` expectation for pushing ``branch``.
+
+    Callers compare against the remote's default branch, which need not be the
+    branch being pushed. A single ``ls-remote --symref`` reads the remote's
+    default branch and the tip of ``refs/heads/<branch>``: when they are the
+    same branch, the lease stays on the SHA the caller saw; otherwise it is the
+    tip just read (empty when the branch does not exist on the remote yet).
+
+    Args:
+        study_path: Path to local repository with ``origin`` configured
+        branch: Local branch being pushed
+        default_branch_sha: Remote default branch SHA the caller inspected
+
+    Returns:
+        Expected remote SHA of ``refs/heads/<branch>`` ("" for absent)
+
+    Raises:
+        subprocess.CalledProcessError: If the remote cannot be listed
+    """
+    result = subprocess.run(
+        [
+            "git",
+            "-C",
+            str(study_path),
+            "ls-remote",
+            "--symref",
+            "origin",
+            "HEAD",
+            f"refs/heads/{branch}",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    default_ref = None
+    branch_sha = ""
+    for line in result.stdout.splitlines():
+        target, _, ref = line.partition("\t")
+        if target.startswith("ref: ") and ref == "HEAD":
+            default_ref = target[len("ref: ") :]
+        elif ref == f"refs/heads/{branch}":
+            branch_sha = target
+    if default_ref == f"refs/heads/{branch}":
+        return default_branch_sha
+    return branch_sha
+
+
 class PublishError(Exception):
     """Raised when publishing fails."""
 
@@ -88,25 +237,67 @@ class GitHubPublisher:
     def __init__(self, github_token: str, organization_name: str):
         """Initialize GitHub publisher.
 
+        The client is lazy: no request is sent until the organization is first
+        used, so an inaccessible organization is reported by the first call that
+        needs it (e.g. prime_repo_cache()) rather than here.
+
         Args:
             github_token: GitHub personal access token
             organization_name: Name of GitHub organization (e.g., "OpenNeuroStudies")
-
-        Raises:
-            PublishError: If organization cannot be accessed
         """
-        self.github = Github(github_token)
+        self.github = Github(auth=Auth.Token(github_token), lazy=True)
         self.organization_name = organization_name
+        # Populated by prime_repo_cache(); None means look up repositories on demand
+        self._repo_cache: dict[str, Repository] | None = None
+        # REST client with an on-disk response cache, created on first use
+        self._github_token = github_token
+        self._api_client: GitHubClient | None = None
+        self._api_client_lock = threading.Lock()
+        self.organization = self.github.get_organization(organization_name)
+
+    def _api(self) -> GitHubClient:
+        """Get the cached REST client, creating it (and its cache) on first use."""
+        with self._api_client_lock:
+            if self._api_client is None:
+                self._api_client = GitHubClient(token=self._github_token, always_revalidate=True)
+            return self._api_client
+
+    def prime_repo_cache(self) -> None:
+        """Fetch all organization repositories once for subsequent lookups.
+
+        Once primed, repository lookups are answered from the cache rather than a
+        ``get_repo()`` request per study. Worth it when publishing many studies;
+        a single study is cheaper to look up directly.
 
+        Raises:
+            PublishError: If the organization cannot be accessed or listing fails
+        """
         try:
-            self.organization = self.github.get_organization(organization_name)
+            self._repo_cache = list_organization_repos(self.organization)
         except UnknownObjectException as e:
             raise PublishError(
-                f"Organization '{organization_name}' not found. "
+                f"Organization '{self.organization_name}' not found. "
                 f"Check organization name and ensure you have access."
             ) from e
         except GithubException as e:
-            raise PublishError(f"Failed to access organization '{organization_name}': {e}") from e
+            raise PublishError(
+                f"Failed to list repositories of '{self.organization_name}': {e}"
+            ) from e
+
+    def _get_repo(self, repo_name: str) -> Repository:
+        """Get a repository, from the primed cache if available.
+
+        Raises:
+            UnknownObjectException: If the repository does not exist
+        """
+        if self._repo_cache is None:
+            return self.organization.get_repo(repo_name)
+        try:
+            return self._repo_cache[repo_name]
+        except KeyError:
+            raise UnknownObjectException(
+                status=404, data={"message": "Not Found"}, headers={}
+            ) from None
 
     def repository_exists(self, repo_name: str) -> bool:
         """Check if a repository exists in the organization.
@@ -118,7 +309,7 @@ class GitHubPublisher:
             True if repository exists, False otherwise
         """
         try:
-            self.organization.get_repo(repo_name)
+            self._get_repo(repo_name)
             return True
         except UnknownObjectException:
             return False
@@ -132,22 +323,19 @@ class GitHubPublisher:
         Args:
             repo_name: Repository name
 
+        The lookup goes through GitHubClient's response cache, revalidated by
+        ETag on every call: an unchanged remote costs a 304, which does not count
+        against the rate limit, yet a new push is never missed.
+
         Returns:
             Commit SHA if found, None if repository doesn't exist or has no commits
         """
-        try:
-            repo = self.organization.get_repo(repo_name)
-            # Get default branch HEAD
-            try:
-                branch = repo.get_branch(repo.default_branch)
-                return branch.commit.sha
-            except GithubException:
-                # Repository exists but has no commits yet
-                return None
-        except UnknownObjectException:
+        if self._repo_cache is not None and repo_name not in self._repo_cache:
             return None
-        except GithubException as e:
-            logger.warning(f"Error getting remote HEAD for {repo_name}: {e}")
+        try:
+            return self._api().get_default_branch_sha(self.organization_name, repo_name)
+        except GitHubAPIError as e:
+            logger.warning(f"Could not get remote HEAD for {repo_name}: {e}")
             return None
 
     def create_repository(
@@ -180,6 +368,8 @@ class GitHubPublisher:
                 has_projects=False,
             )
             logger.info(f"Created repository: {repo.html_url}")
+            if self._repo_cache is not None:
+                self._repo_cache[repo_name] = repo
             return repo.clone_url
         except GithubException as e:
             raise PublishError(f"Failed to create repository '{repo_name}': {e}") from e
@@ -194,8 +384,10 @@ class GitHubPublisher:
             PublishError: If deletion fails
         """
         try:
-            repo = self.organization.get_repo(repo_name)
+            repo = self._get_repo(repo_name)
             repo.delete()
+            if self._repo_cache is not None:
+                self._repo_cache.pop(repo_name, None)
             logger.info(f"Deleted repository: {self.organization_name}/{repo_name}")
         except UnknownObjectException as e:
             raise PublishError(f"Repository '{repo_name}' not found") from e
@@ -214,6 +406,11 @@ class GitHubPublisher:
         Raises:
             PublishError: If getting commit SHA fails
         """
+        if PYGIT2_AVAILABLE:
+            probe = _pygit2_probe(study_path)
+            if probe is not None:
+                return probe[0]
+
         try:
             result = subprocess.run(
                 ["git", "-C", str(study_path), "rev-parse", "HEAD"],
@@ -261,6 +458,7 @@ class GitHubPublisher:
         study_path: Path,
         repo_url: str,
         force: bool = False,
+        expected_remote_sha: str | None = None,
     ) -> str:
         """Push local repository to GitHub.
 
@@ -268,6 +466,9 @@ class GitHubPublisher:
             study_path: Path to local study repository
             repo_url: GitHub repository URL
             force: Whether to force push (default: False)
+            expected_remote_sha: Remote default branch SHA the caller last saw; a
+                forced push then uses ``--force-with-lease`` on the pushed branch
+                so it cannot clobber commits pushed to GitHub in the meantime
 
         Returns:
             Commit SHA that was pushed
@@ -276,59 +477,42 @@ class GitHubPublisher:
             PublishError: If push fails
         """
         try:
-            # Get local HEAD SHA before pushing
-            local_sha = self.get_local_head_sha(study_path)
-
-            # Check if remote 'origin' exists
-            result = subprocess.run(
-                ["git", "-C", str(study_path), "remote", "get-url", "origin"],
-                capture_output=True,
-                text=True,
-                check=False,
-            )
+            # Local HEAD, branch (main or master) and current origin in one probe
+            local_sha, branch, existing_url = _git_probe(study_path)
 
-            if result.returncode != 0:
+            if existing_url is None:
                 # Add remote
                 subprocess.run(
                     ["git", "-C", str(study_path), "remote", "add", "origin", repo_url],
                     check=True,
-                    capture_output=True,
-                    text=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
                 )
                 logger.info(f"Added remote origin: {repo_url}")
-            else:
-                # Remote exists - verify it matches
-                existing_url = result.stdout.strip()
-                if existing_url != repo_url:
-                    # Update remote URL
-                    subprocess.run(
-                        ["git", "-C", str(study_path), "remote", "set-url", "origin", repo_url],
-                        check=True,
-                        capture_output=True,
-                        text=True,
-                    )
-                    logger.info(f"Updated remote origin: {repo_url}")
-
-            # Detect default branch (main or master)
-            result = subprocess.run(
-                ["git", "-C", str(study_path), "rev-parse", "--abbrev-ref", "HEAD"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            branch = result.stdout.strip()
-
-            # Push to GitHub
-            push_args = ["git", "-C", str(study_path), "push"]
-            if force:
+            elif existing_url != repo_url:
+                # Update remote URL
+                subprocess.run(
+                    ["git", "-C", str(study_path), "remote", "set-url", "origin", repo_url],
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                )
+                logger.info(f"Updated remote origin: {repo_url}")
+
+            # Push to GitHub; only stderr is kept, and decoded only on failure
+            push_args = ["git", *_push_config_args(), "-C", str(study_path), "push", "--quiet"]
+            if force and expected_remote_sha:
+                lease = _lease_sha(study_path, branch, expected_remote_sha)
+                push_args.append(f"--force-with-lease={branch}:{lease}")
+            elif force:
                 push_args.append("--force")
             push_args.extend(["origin", branch])
 
             subprocess.run(
                 push_args,
                 check=True,
-                capture_output=True,
-                text=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
             )
             logger.info(f"Pushed {study_path.name} to {repo_url} (branch: {branch})")
 
@@ -336,12 +520,15 @@ class GitHubPublisher:
 
         except subprocess.CalledProcessError as e:
             error_msg = e.stderr if e.stderr else str(e)
+            if isinstance(error_msg, bytes):
+                error_msg = error_msg.decode("utf-8", "replace")
             raise PublishError(f"Failed to push {study_path.name}: {error_msg}") from e
 
     def publish_study(
         self,
         study_path: Path,
         force: bool = False,
+        local_sha: str | None = None,
     ) -> tuple[str, str, bool]:
         """Publish a study repository to GitHub.
 
@@ -350,6 +537,8 @@ class GitHubPublisher:
         Args:
             study_path: Path to local study repository
             force: Whether to force push if remote differs (default: False)
+            local_sha: Local HEAD SHA if the caller already resolved it
+                (saves another ``git rev-parse``)
 
         Returns:
             Tuple of (github_url, commit_sha, was_created)
@@ -366,6 +555,7 @@ class GitHubPublisher:
         # Check if repository exists
         exists = self.repository_exists(repo_name)
         was_created = not exists
+        remote_sha = None
 
         if not exists:
             # Create repository
@@ -374,28 +564,32 @@ class GitHubPublisher:
             # Use existing repository
             repo_url = f"https://github.com/{self.organization_name}/{repo_name}.git"
 
-            # Check if remote matches local
-            if not force:
-                remote_sha = self.get_remote_head_sha(repo_name)
+            # Check if remote matches local; nothing to push if it does, even with force
+            remote_sha = self.get_remote_head_sha(repo_name)
+            if local_sha is None:
                 local_sha = self.get_local_head_sha(study_path)
 
-                if remote_sha and remote_sha == local_sha:
-                    logger.info(f"{repo_name} already up-to-date")
-                    return (repo_url, local_sha, was_created)
-                elif remote_sha and remote_sha != local_sha:
-                    # Check if this is a fast-forward (local contains all remote commits)
-                    if self.is_fast_forward(study_path, local_sha, remote_sha):
-                        logger.info(f"{repo_name} can be fast-forwarded (local: {local_sha[:8]}, remote: {remote_sha[:8]})")
-                        # Allow push - it's a clean fast-forward update
-                    else:
-                        # Histories have diverged - require --force
-                        raise PublishError(
-                            f"{repo_name} has diverged from GitHub (not a fast-forward). "
-                            f"Use --force to overwrite (local: {local_sha[:8]}, remote: {remote_sha[:8]})"
-                        )
+            if remote_sha and remote_sha == local_sha:
+                logger.info(f"{repo_name} already up-to-date")
+                return (repo_url, local_sha, was_created)
+            elif remote_sha and not force:
+                # Check if this is a fast-forward (local contains all remote commits)
+                if self.is_fast_forward(study_path, local_sha, remote_sha):
+                    logger.info(
+                        f"{repo_name} can be fast-forwarded (local: {local_sha[:8]}, remote: {remote_sha[:8]})"
+                    )
+                    # Allow push - it's a clean fast-forward update
+                else:
+                    # Histories have diverged - require --force
+                    raise PublishError(
+                        f"{repo_name} has diverged from GitHub (not a fast-forward). "
+                        f"Use --force to overwrite (local: {local_sha[:8]}, remote: {remote_sha[:8]})"
+                    )
 
         # Push to GitHub
-        commit_sha = self.push_to_github(study_path, repo_url, force=force)
+        commit_sha = self.push_to_github(
+            study_path, repo_url, force=force, expected_remote_sha=remote_sha
+        )
 
         github_url = f"https://github.com/{self.organization_name}/{repo_name}"
         return (github_url, commit_sha, was_created)
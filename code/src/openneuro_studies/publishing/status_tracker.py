@@ -1,6 +1,5 @@
 """Publication status tracking for study repositories."""
 
-import json
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -26,10 +25,9 @@ def load_publication_status(config_dir: Path = Path(".openneuro-studies")) -> Pu
         # Return empty status - will need organization set later
         return PublicationStatus(studies=[], organization="", last_updated=datetime.utcnow())
 
-    with open(status_file) as f:
-        data = json.load(f)
-
-    return PublicationStatus(**data)
+    # pydantic-core parses and validates the bytes in one pass
+    with open(status_file, "rb") as f:
+        return PublicationStatus.model_validate_json(f.read())
 
 
 def save_publication_status(
@@ -39,7 +37,9 @@ def save_publication_status(
 ) -> None:
     """Save publication status to JSON file.
 
-    Studies are sorted by study_id for deterministic output.
+    Studies are sorted by study_id for deterministic output. Committing runs a
+    ``datalad save``, so batch callers pass commit=False for intermediate
+    writes and commit once (see PublicationTracker.flush()).
 
     Args:
         status: PublicationStatus to save
@@ -52,11 +52,10 @@ def save_publication_status(
     # Update last_updated timestamp
     status.last_updated = datetime.utcnow()
 
-    # Convert to serializable format
-    data = status.model_dump(mode="json")
-
-    with open(status_file, "w") as f:
-        json.dump(data, f, indent=2)
+    # Serialize natively; unlike json.dump, non-ASCII text is written as UTF-8
+    # rather than \u-escaped, so the encoding must be explicit
+    with open(status_file, "w", encoding="utf-8") as f:
+        f.write(status.model_dump_json(indent=2))
 
     # Commit to .openneuro-studies subdataset
     if commit:
@@ -78,6 +77,9 @@ class PublicationTracker:
     """Helper class for tracking publication status.
 
     Provides convenience methods for common publication tracking operations.
+    Used as a context manager, it saves (and commits) once on exit if any
+    study was marked published or unpublished, so a batch of updates costs a
+    single ``datalad save``.
 
     Attributes:
         status: Current publication status
@@ -92,6 +94,14 @@ class PublicationTracker:
         """
         self.config_dir = config_dir
         self.status = load_publication_status(config_dir)
+        self._dirty = False
+
+    def __enter__(self) -> "PublicationTracker":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        # Flush even when the batch was interrupted: marked studies were published
+        self.flush()
 
     def mark_published(
         self,
@@ -119,6 +129,7 @@ class PublicationTracker:
             last_push_at=datetime.utcnow(),
         )
         self.status.add_study(study)
+        self._dirty = True
 
     def mark_unpublished(self, study_id: str) -> bool:
         """Mark a study as unpublished (remove from tracking).
@@ -129,7 +140,9 @@ class PublicationTracker:
         Returns:
             True if study was removed, False if not found
         """
-        return self.status.remove_study(study_id)
+        removed = self.status.remove_study(study_id)
+        self._dirty = self._dirty or removed
+        return removed
 
     def is_published(self, study_id: str) -> bool:
         """Check if a study is published.
@@ -157,3 +170,9 @@ class PublicationTracker:
             commit: Whether to commit to git (default: True)
         """
         save_publication_status(self.status, self.config_dir, commit=commit)
+        self._dirty = False
+
+    def flush(self) -> None:
+        """Save and commit the status once, if any study was marked since the last save."""
+        if self._dirty:
+            self.save(commit=True)
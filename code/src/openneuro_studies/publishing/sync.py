@@ -1,14 +1,34 @@
 """Synchronize publication status with GitHub state."""
 
 import logging
+import re
 from datetime import datetime
 
-from github import Github, GithubException, UnknownObjectException
-
 from openneuro_studies.models import PublicationStatus, PublishedStudy
+from openneuro_studies.utils import GitHubAPIError, GitHubClient
 
 logger = logging.getLogger(__name__)
 
+# Same constraint as PublishedStudy.study_id; checked up front so that entries
+# built from GitHub data can skip model validation
+_STUDY_ID_RE = re.compile(r"^study-ds\d+$")
+
+# Name, URL and default branch HEAD of 100 repositories per request
+_ORG_REPOS_QUERY = """
+query($org: String!, $cursor: String) {
+  organization(login: $org) {
+    repositories(first: 100, after: $cursor) {
+      nodes {
+        name
+        url
+        defaultBranchRef { target { oid } }
+      }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+
 
 class SyncResult:
     """Result of a sync operation.
@@ -51,82 +71,93 @@ def sync_publication_status(
     github_token: str,
     organization_name: str,
     status: PublicationStatus,
+    expected_names: set[str] | None = None,
 ) -> SyncResult:
     """Synchronize publication status with GitHub state.
 
     Reconciles local published-studies.json with actual repositories on GitHub:
-    1. Queries GitHub API for all repos matching study-* pattern
+    1. Queries the GitHub GraphQL API for all repos matching study-* pattern,
+       along with their default branch HEAD
     2. Adds entries for repos on GitHub but not in tracking (manual additions)
     3. Removes entries in tracking but not on GitHub (manual deletions)
-    4. Updates commit SHAs for all tracked studies by querying remote HEAD
+    4. Updates commit SHAs for all tracked studies from the remote HEAD
 
     Args:
         github_token: GitHub personal access token
         organization_name: GitHub organization name
         status: Current PublicationStatus to sync
+        expected_names: Study IDs the caller cares about (e.g. local study
+            directories). Listing stops at the first page by which all of them
+            and all tracked studies were seen, so further untracked repositories
+            are not added. None (default) lists the whole organization.
 
     Returns:
         SyncResult with summary of changes
 
     Raises:
-        GithubException: If GitHub API queries fail
+        GitHubAPIError: If GitHub API queries fail
     """
     result = SyncResult()
-    github = Github(github_token)
-
-    try:
-        organization = github.get_organization(organization_name)
-    except UnknownObjectException as e:
-        raise GithubException(
-            status=404,
-            data={"message": f"Organization '{organization_name}' not found"},
-            headers={},
-        ) from e
-
-    # Get all study-* repositories from GitHub
-    try:
-        repos = organization.get_repos()
-        github_studies = {}  # study_id -> (repo_url, commit_sha)
-
-        for repo in repos:
-            repo_name = repo.name
-            if not repo_name.startswith("study-"):
+    client = GitHubClient(token=github_token)
+
+    # Get current tracked studies
+    tracked_studies = {s.study_id: s for s in status.studies}
+    if expected_names is not None:
+        expected_names = expected_names | tracked_studies.keys()
+
+    # Get all study-* repositories from GitHub, a page of 100 per GraphQL query
+    github_studies = {}  # study_id -> (repo_url, commit_sha)
+    cursor = None
+    while True:
+        try:
+            data = client.graphql(_ORG_REPOS_QUERY, {"org": organization_name, "cursor": cursor})
+        except GitHubAPIError as e:
+            logger.error(f"Failed to list repositories: {e}")
+            raise
+        if data.get("organization") is None:
+            raise GitHubAPIError(f"Organization '{organization_name}' not found")
+
+        repositories = data["organization"]["repositories"]
+        for repo in repositories["nodes"]:
+            repo_name = repo["name"]
+            if not _STUDY_ID_RE.match(repo_name):
                 continue
 
-            # Get HEAD commit SHA if available
-            try:
-                branch = repo.get_branch(repo.default_branch)
-                commit_sha = branch.commit.sha
-            except GithubException:
-                # Repository exists but has no commits yet
+            # HEAD commit SHA, if the default branch has any commits
+            if repo["defaultBranchRef"] is None:
                 logger.warning(f"Repository {repo_name} has no commits, skipping")
                 continue
 
-            github_studies[repo_name] = (repo.html_url, commit_sha)
+            github_studies[repo_name] = (repo["url"], repo["defaultBranchRef"]["target"]["oid"])
 
-    except GithubException as e:
-        logger.error(f"Failed to list repositories: {e}")
-        raise
+        if not repositories["pageInfo"]["hasNextPage"]:
+            break
+        if expected_names is not None and expected_names <= github_studies.keys():
+            logger.debug("All expected studies found, not listing further repositories")
+            break
+        cursor = repositories["pageInfo"]["endCursor"]
 
-    # Get current tracked studies
-    tracked_studies = {s.study_id: s for s in status.studies}
-
-    # Find studies on GitHub but not tracked locally (manual additions)
+    # Find studies on GitHub but not tracked locally (manual additions).
+    # Fields are already valid (checked study ID, 40-char oid from GitHub), so
+    # build entries without validation and sort the list once at the end.
+    now = datetime.utcnow()
     for study_id, (github_url, commit_sha) in github_studies.items():
         if study_id not in tracked_studies:
             # Add new entry
-            now = datetime.utcnow()
-            new_study = PublishedStudy(
+            new_study = PublishedStudy.model_construct(
                 study_id=study_id,
                 github_url=github_url,
                 published_at=now,  # We don't know original publish time
                 last_push_commit_sha=commit_sha,
                 last_push_at=now,
             )
-            status.add_study(new_study)
+            status.studies.append(new_study)
             result.added += 1
             result.added_studies.append(study_id)
             logger.info(f"Added {study_id} to tracking (found on GitHub)")
+    if result.added:
+        status.studies.sort(key=lambda s: s.study_id)
+        status.last_updated = now
 
     # Find studies tracked locally but not on GitHub (manual deletions)
     for study_id in list(tracked_studies.keys()):
@@ -136,20 +167,17 @@ def sync_publication_status(
             result.removed_studies.append(study_id)
             logger.info(f"Removed {study_id} from tracking (deleted from GitHub)")
 
-    # Update commit SHAs for studies that exist in both places
+    # Update commit SHAs for studies that exist in both places; the SHA comes
+    # straight from GitHub, so update the tracked model in place rather than
+    # re-validating a new one and re-sorting the list
     for study_id, (_github_url, github_sha) in github_studies.items():
-        tracked_study = status.get_study(study_id)
+        tracked_study = tracked_studies.get(study_id)
         if tracked_study and tracked_study.last_push_commit_sha != github_sha:
             # Update with new SHA
             old_sha = tracked_study.last_push_commit_sha
-            updated_study = PublishedStudy(
-                study_id=study_id,
-                github_url=tracked_study.github_url,
-                published_at=tracked_study.published_at,
-                last_push_commit_sha=github_sha,
-                last_push_at=datetime.utcnow(),
-            )
-            status.add_study(updated_study)
+            tracked_study.last_push_commit_sha = github_sha
+            tracked_study.last_push_at = datetime.utcnow()
+            status.last_updated = tracked_study.last_push_at
             result.updated += 1
             result.updated_studies.append((study_id, old_sha, github_sha))
             logger.info(f"Updated {study_id} commit SHA: {old_sha[:8]} → {github_sha[:8]}")
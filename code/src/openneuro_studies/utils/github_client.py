@@ -1,14 +1,20 @@
 """GitHub API client with caching."""
 
+import functools
 import logging
 import os
+import random
+import re
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests_cache import CachedSession
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +33,65 @@ logger = logging.getLogger(__name__)
 # Global lock for rate limit coordination across threads
 _rate_limit_lock = threading.Lock()
 
+# Below this many remaining requests, pace calls until the rate limit resets
+_RATE_LIMIT_LOW_WATER = 5
+
+# Longest single pacing pause; running out anyway still waits for the reset on the 403
+_RATE_LIMIT_MAX_PAUSE = 60.0
+
+# Monotonic time up to which paced requests are already scheduled (guarded by
+# _rate_limit_lock), so threads pacing at once take successive slots
+_paced_until = 0.0
+
+# Concurrent page fetches for unfiltered listings; stays under GitHub's
+# secondary limit on concurrent requests
+_PAGE_FETCH_WORKERS = 8
+
+# Page number of the rel="last" link in a paginated response's Link header
+_LAST_PAGE_RE = re.compile(r'[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+# Repository fields needed by discovery, fetched via GraphQL instead of full REST objects
+_REPO_FIELDS = "name url defaultBranchRef { name target { oid } }"
+
+_ORG_REPOS_QUERY = (
+    """
+query($org: String!, $cursor: String) {
+  organization(login: $org) {
+    repositories(first: 100, after: $cursor, privacy: PUBLIC) {
+      nodes { %s }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+    % _REPO_FIELDS
+)
+
+# Repositories looked up per aliased GraphQL document when filtering by name
+_GRAPHQL_BATCH_SIZE = 50
+
+# Decoded files kept per client for commit-pinned get_file_content() calls
+_FILE_CONTENT_CACHE_SIZE = 1024
+
+_COMMIT_SHA_RE = re.compile(r"^[0-9a-f]{40}$")
+
+_RAW_MEDIA_TYPE = "application/vnd.github.raw"
+
+
+def _repo_from_graphql(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a GraphQL repository node like the REST listing entries consumers expect.
+
+    Adds ``default_branch_sha`` (None for an empty repository) which the REST
+    listing does not provide.
+    """
+    ref = node.get("defaultBranchRef") or {}
+    return {
+        "name": node["name"],
+        "clone_url": f"{node['url']}.git",
+        "default_branch": ref.get("name", "main"),
+        "default_branch_sha": (ref.get("target") or {}).get("oid"),
+    }
+
 
 class GitHubAPIError(Exception):
     """Raised when GitHub API request fails."""
@@ -49,6 +114,7 @@ class GitHubClient:
         cache_dir: str = ".openneuro-studies/cache",
         cache_expire_after: int = 86400,
         max_connections: int = 50,
+        always_revalidate: bool = False,
     ):
         """Initialize GitHub client.
 
@@ -56,8 +122,13 @@ class GitHubClient:
             token: GitHub personal access token. If None, reads from GITHUB_TOKEN env var.
                    If no token provided, will use unauthenticated requests (lower rate limit).
             cache_dir: Directory for cache storage
-            cache_expire_after: Cache expiration time in seconds (default: 1 hour)
+            cache_expire_after: Cache expiration time in seconds (default: 1 day). Expired
+                   entries are kept and revalidated with their ETag, so an unchanged
+                   resource costs a bodyless 304 rather than a full download
             max_connections: Maximum number of connections in pool (default: 50)
+            always_revalidate: Revalidate cached responses (ETag) on every request, for
+                   data that must be current; unchanged resources come back as 304s,
+                   which do not count against the rate limit (default: False)
         """
         self.token = token or os.getenv("GITHUB_TOKEN")
 
@@ -71,17 +142,28 @@ class GitHubClient:
             expire_after=cache_expire_after,
             allowable_methods=["GET"],
             stale_if_error=True,  # Use stale cache if API fails
+            always_revalidate=always_revalidate,
+            wal=True,  # Write-ahead log: parallel workers' reads don't block cache writes
+            match_headers=["Accept"],  # Raw file bodies and JSON envelopes share URLs
         )
 
         # Configure connection pool size for parallel workers
         # HTTPAdapter settings: pool_connections controls number of connection pools
         # pool_maxsize controls max connections per pool
-        from requests.adapters import HTTPAdapter
-
+        # Transient failures (connection errors, 5xx) are retried here on the kept-alive
+        # connection; rate limits (403/429) are left to _do_request(), which coordinates
+        # waiting across threads
         adapter = HTTPAdapter(
             pool_connections=max_connections,
             pool_maxsize=max_connections,
-            max_retries=0,  # We handle retries in _request()
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=frozenset({"GET", "POST"}),  # GraphQL queries are reads
+                respect_retry_after_header=False,
+                raise_on_status=False,
+            ),
         )
         self.session.mount("https://", adapter)
         self.session.mount("http://", adapter)
@@ -95,6 +177,18 @@ class GitHubClient:
 
         self.base_url = "https://api.github.com"
 
+        # Content at a commit SHA never changes: keep it decoded, skipping even the
+        # cache lookup and base64 decode on repeated reads
+        self._file_content_at_commit = functools.lru_cache(maxsize=_FILE_CONTENT_CACHE_SIZE)(
+            self._fetch_file_content
+        )
+
+        # GraphQL POSTs bypass the response cache: keep each listing for the
+        # client's lifetime so a run lists an organization only once
+        self._graphql_listings: Dict[
+            Tuple[str, Optional[Tuple[str, ...]]], List[Dict[str, Any]]
+        ] = {}
+
     def _request(
         self, endpoint: str, params: Optional[Dict[str, Any]] = None, retry: int = 3
     ) -> Any:
@@ -111,21 +205,41 @@ class GitHubClient:
         Raises:
             GitHubAPIError: If request fails after retries
         """
+        data, _headers = self._request_with_headers(endpoint, params, retry)
+        return data
+
+    def _request_with_headers(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None, retry: int = 3
+    ) -> Tuple[Any, Mapping[str, str]]:
+        """Like _request(), but also return the response headers (e.g. ``Link``)."""
         url = f"{self.base_url}{endpoint}"
+        response = self._send(url, params, retry)
+        return self._parse_response(response, url), response.headers
 
+    def _send(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        retry: int = 3,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        """Send a GET with retries, returning the successful response object."""
         for attempt in range(retry):
             try:
-                response = self._do_request(url, params)
-                return self._parse_response(response, url)
+                return self._do_request(url, params, headers)
 
             except GitHubAPIError:
                 raise  # Propagate our own errors without re-wrapping
+            except requests.exceptions.HTTPError as e:
+                # 4xx will not change on retry; 5xx were already retried by the adapter
+                raise GitHubAPIError(f"GitHub API request failed for {url}: {e}") from e
             except requests.exceptions.RequestException as e:
                 if attempt == retry - 1:
                     raise GitHubAPIError(
                         f"GitHub API request failed for {url}: {e}"
                     ) from e
-                time.sleep(2**attempt)
+                # Full jitter keeps parallel workers from retrying in lockstep
+                time.sleep(random.uniform(0, 2**attempt))
             except Exception as e:
                 # Cache backend errors (e.g., sqlite3.OperationalError) or other
                 # unexpected failures — wrap with context for troubleshooting
@@ -137,12 +251,25 @@ class GitHubClient:
 
         raise GitHubAPIError(f"Failed to fetch {url} after {retry} attempts")
 
-    def _do_request(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    def _do_request(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
         """Execute a single HTTP request, handling rate limits.
 
         Returns the response object. Raises on HTTP errors or rate limit exhaustion.
         """
-        response = self.session.get(url, params=params, timeout=30)
+        response = self.session.get(url, params=params, headers=headers, timeout=30)
+
+        # Secondary rate limits (abuse detection) say how long to back off
+        retry_after = self._retry_after(response)
+        if retry_after is not None:
+            wait = retry_after + random.uniform(0, 1)
+            logger.warning("Secondary rate limit hit for %s. Waiting %.1f seconds...", url, wait)
+            time.sleep(wait)
+            response = self.session.get(url, params=params, headers=headers, timeout=30)
 
         # Handle rate limiting
         if response.status_code == 403 and "rate limit" in response.text.lower():
@@ -166,7 +293,7 @@ class GitHubClient:
                         time.sleep(current_wait + 1)
 
                 # Retry after waiting
-                response = self.session.get(url, params=params, timeout=30)
+                response = self.session.get(url, params=params, headers=headers, timeout=30)
 
         response.raise_for_status()
 
@@ -178,12 +305,58 @@ class GitHubClient:
             )
             response = self.session.get(
                 url, params=params, timeout=30,
-                headers={"Cache-Control": "no-cache"},
+                headers={**(headers or {}), "Cache-Control": "no-cache"},
             )
             response.raise_for_status()
 
+        self._pace_rate_limit(response)
         return response
 
+    @staticmethod
+    def _retry_after(response: Any) -> Optional[float]:
+        """Seconds to wait from a 403/429 ``Retry-After`` header, if present."""
+        if response.status_code not in (403, 429):
+            return None
+        try:
+            return float(response.headers["Retry-After"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _pace_rate_limit(response: Any) -> None:
+        """Spread the last few requests of the rate limit budget until its reset.
+
+        Sleeping ``(reset - now) / remaining`` before the budget is exhausted
+        avoids a burst of 403s followed by one long wait. Each pause is reserved
+        as the next slot under ``_rate_limit_lock`` and slept outside it, capped
+        at ``_RATE_LIMIT_MAX_PAUSE``, so threads are spread out without one
+        blocking the others for a whole reset window.
+        """
+        global _paced_until
+        if getattr(response, "from_cache", False):
+            return  # Cached headers describe an old budget
+        try:
+            remaining = int(response.headers["X-RateLimit-Remaining"])
+            reset_time = int(response.headers["X-RateLimit-Reset"])
+        except (KeyError, TypeError, ValueError):
+            return
+        if remaining >= _RATE_LIMIT_LOW_WATER:
+            return
+
+        wait = max(0.0, reset_time - time.time()) / max(remaining, 1)
+        if wait <= 0:
+            return
+        with _rate_limit_lock:
+            now = time.monotonic()
+            _paced_until = min(max(_paced_until, now) + wait, now + _RATE_LIMIT_MAX_PAUSE)
+            pause = _paced_until - now
+        logger.info(
+            "Rate limit nearly exhausted (%d remaining). Pausing %.1f seconds...",
+            remaining,
+            pause,
+        )
+        time.sleep(pause)
+
     def _parse_response(self, response: Any, url: str) -> Any:
         """Parse JSON from response, raising GitHubAPIError on failure."""
         try:
@@ -195,6 +368,52 @@ class GitHubClient:
                 f"length={response.headers.get('content-length')})"
             ) from e
 
+    def graphql(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        allow_errors: bool = False,
+    ) -> Dict[str, Any]:
+        """Run a query against the GitHub GraphQL API.
+
+        One GraphQL query can return fields that would otherwise take a REST
+        request per repository (e.g. default branch HEAD of every listed repo).
+        POST requests bypass the response cache.
+
+        Args:
+            query: GraphQL query document
+            variables: Query variables
+            allow_errors: Return partial ``data`` despite reported errors (e.g. NOT_FOUND
+                   for some of several aliased repository lookups)
+
+        Returns:
+            The ``data`` member of the response
+
+        Raises:
+            GitHubAPIError: If the request fails or the response reports errors
+        """
+        url = f"{self.base_url}/graphql"
+        try:
+            response = self.session.post(
+                url, json={"query": query, "variables": variables or {}}, timeout=30
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            raise GitHubAPIError(f"GitHub GraphQL request failed for {url}: {e}") from e
+        self._pace_rate_limit(response)  # GraphQL reports its own points budget
+
+        payload: Any = self._parse_response(response, url)
+        if allow_errors and isinstance(payload, dict) and payload.get("data") is not None:
+            if payload.get("errors"):
+                logger.debug("GitHub GraphQL query reported errors: %s", payload["errors"])
+            partial: Dict[str, Any] = payload["data"]
+            return partial
+        if not isinstance(payload, dict) or payload.get("errors") or "data" not in payload:
+            errors = payload.get("errors") if isinstance(payload, dict) else payload
+            raise GitHubAPIError(f"GitHub GraphQL query failed: {errors}")
+        data: Dict[str, Any] = payload["data"]
+        return data
+
     def list_repositories(
         self, organization: str, dataset_filter: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
@@ -204,21 +423,62 @@ class GitHubClient:
             organization: GitHub organization name
             dataset_filter: Optional list of dataset IDs to filter (e.g., ["ds000001", "ds005256"])
 
+        With a token, repositories are listed through GraphQL (only the fields
+        discovery needs, 100 per request, or a single aliased lookup per 50 names
+        when filtering). GraphQL requires authentication, so unauthenticated
+        clients page through the REST listing instead. GraphQL listings are
+        kept for the client's lifetime (POSTs bypass the response cache); REST
+        pages go through the response cache.
+
         Returns:
             List of repository dictionaries
 
         Raises:
             GitHubAPIError: If request fails
         """
+        if self.token:
+            key = (organization, tuple(dataset_filter) if dataset_filter else None)
+            listing = self._graphql_listings.get(key)
+            if listing is None:
+                if dataset_filter:
+                    listing = self._lookup_repositories_graphql(organization, dataset_filter)
+                else:
+                    listing = self._list_repositories_graphql(organization)
+                self._graphql_listings[key] = listing
+            return list(listing)
+
         repos: List[Dict[str, Any]] = []
         page = 1
         per_page = 100
+        endpoint = f"/orgs/{organization}/repos"
+
+        def page_params(page: int) -> Dict[str, Any]:
+            return {"page": page, "per_page": per_page, "type": "public"}
+
+        first_page, headers = self._request_with_headers(endpoint, page_params(1))
+
+        # Without a filter every page is needed: once page 1 tells the page count,
+        # fetch the rest concurrently instead of one round trip after another
+        link = headers.get("Link") if not dataset_filter else None
+        match = _LAST_PAGE_RE.search(link) if isinstance(link, str) else None
+        if match and isinstance(first_page, list):
+            last_page = int(match.group(1))
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(_PAGE_FETCH_WORKERS, last_page - 1))
+            ) as executor:
+                rest = executor.map(
+                    lambda p: self._request(endpoint, page_params(p)), range(2, last_page + 1)
+                )
+                pages = [first_page, *rest]
+            for page_data in pages:
+                if isinstance(page_data, list):
+                    repos.extend(page_data)
+            return repos
 
         while True:
-            endpoint = f"/orgs/{organization}/repos"
-            params = {"page": page, "per_page": per_page, "type": "public"}
-
-            response_data: Any = self._request(endpoint, params)
+            response_data: Any = (
+                first_page if page == 1 else self._request(endpoint, page_params(page))
+            )
 
             if not response_data:
                 break
@@ -245,6 +505,51 @@ class GitHubClient:
 
         return repos
 
+    def _list_repositories_graphql(self, organization: str) -> List[Dict[str, Any]]:
+        """List all public repositories of an organization via GraphQL."""
+        repos: List[Dict[str, Any]] = []
+        cursor: Optional[str] = None
+        while True:
+            data = self.graphql(_ORG_REPOS_QUERY, {"org": organization, "cursor": cursor})
+            if data.get("organization") is None:
+                raise GitHubAPIError(f"Organization '{organization}' not found")
+            repositories = data["organization"]["repositories"]
+            repos.extend(_repo_from_graphql(node) for node in repositories["nodes"] if node)
+            if not repositories["pageInfo"]["hasNextPage"]:
+                return repos
+            cursor = repositories["pageInfo"]["endCursor"]
+
+    def _lookup_repositories_graphql(
+        self, organization: str, names: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Look up named repositories with aliased GraphQL queries; missing ones are skipped."""
+        nodes = self._graphql_repositories([(organization, name) for name in names])
+        return [_repo_from_graphql(node) for node in nodes if node]
+
+    def _graphql_repositories(
+        self, repos: List[Tuple[str, str]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Fetch (owner, name) repositories as aliased ``r0: repository(...)`` queries.
+
+        Returns one GraphQL node per input, in order; None where the repository
+        does not exist or is not visible.
+        """
+        nodes: List[Optional[Dict[str, Any]]] = []
+        for start in range(0, len(repos), _GRAPHQL_BATCH_SIZE):
+            batch = repos[start : start + _GRAPHQL_BATCH_SIZE]
+            params = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(len(batch)))
+            lookups = " ".join(
+                f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ {_REPO_FIELDS} }}"
+                for i in range(len(batch))
+            )
+            variables: Dict[str, Any] = {}
+            for i, (owner, name) in enumerate(batch):
+                variables[f"o{i}"] = owner
+                variables[f"n{i}"] = name
+            data = self.graphql(f"query({params}) {{ {lookups} }}", variables, allow_errors=True)
+            nodes.extend(data.get(f"r{i}") for i in range(len(batch)))
+        return nodes
+
     def get_file_content(self, owner: str, repo: str, file_path: str, ref: str = "HEAD") -> str:
         """Get content of a file from repository.
 
@@ -260,24 +565,57 @@ class GitHubClient:
         Raises:
             GitHubAPIError: If file not found or request fails
         """
-        endpoint = f"/repos/{owner}/{repo}/contents/{file_path}"
-        params = {"ref": ref}
+        if _COMMIT_SHA_RE.match(ref):
+            content: str = self._file_content_at_commit(owner, repo, file_path, ref)
+            return content
+        return self._fetch_file_content(owner, repo, file_path, ref)
 
-        response_data: Any = self._request(endpoint, params)
+    def _fetch_file_content(self, owner: str, repo: str, file_path: str, ref: str) -> str:
+        """Fetch a file through the contents API as raw bytes.
 
-        if not isinstance(response_data, dict) or "content" not in response_data:
-            raise GitHubAPIError(f"File {file_path} has no content field")
+        The raw media type skips the JSON envelope and its base64 encoding (a third
+        more bytes on the wire) and is not limited to files under 1 MB.
+        """
+        url = f"{self.base_url}/repos/{owner}/{repo}/contents/{file_path}"
+        response = self._send(url, {"ref": ref}, headers={"Accept": _RAW_MEDIA_TYPE})
 
-        # GitHub returns base64-encoded content
-        import base64
+        content: Any = response.content
+        if not isinstance(content, bytes):
+            raise GitHubAPIError(f"File {file_path} has no content in {owner}/{repo}@{ref}")
+        try:
+            return content.decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise GitHubAPIError(f"File {file_path} in {owner}/{repo} is not UTF-8: {e}") from e
+
+    def get_default_branch_shas(self, repos: List[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        """Get default branch HEAD SHAs of many repositories in few requests.
 
-        content_encoded: Any = response_data["content"]
-        content = base64.b64decode(content_encoded).decode("utf-8")
-        return content
+        Uses aliased GraphQL queries, up to 50 repositories per request.
+
+        Args:
+            repos: (owner, name) pairs
+
+        Returns:
+            Mapping of (owner, name) to commit SHA; repositories that do not exist
+            or have no commits on their default branch are left out
+
+        Raises:
+            GitHubAPIError: If a request fails
+        """
+        shas: Dict[Tuple[str, str], str] = {}
+        for key, node in zip(repos, self._graphql_repositories(repos), strict=True):
+            sha = _repo_from_graphql(node)["default_branch_sha"] if node else None
+            if sha:
+                shas[key] = sha
+        return shas
 
     def get_default_branch_sha(self, owner: str, repo: str) -> str:
         """Get current commit SHA of default branch.
 
+        Stays on the cached REST commits/HEAD lookup, so repeated checks can be
+        answered with a conditional request (304); use get_default_branch_shas()
+        to resolve many repositories at once.
+
         Args:
             owner: Repository owner
             repo: Repository name
@@ -288,6 +626,14 @@ class GitHubClient:
         Raises:
             GitHubAPIError: If request fails
         """
+        # commits/HEAD resolves the default branch server-side: a single request
+        try:
+            head_data: Any = self._request(f"/repos/{owner}/{repo}/commits/HEAD", retry=1)
+            if isinstance(head_data, dict) and "sha" in head_data:
+                return str(head_data["sha"])
+        except GitHubAPIError:
+            pass  # Empty/broken default branch - look up the branches individually
+
         endpoint = f"/repos/{owner}/{repo}"
         response_data: Any = self._request(endpoint)
 
@@ -353,5 +699,6 @@ class GitHubClient:
 
     def clear_cache(self) -> None:
         """Clear all cached API responses."""
+        self._graphql_listings.clear()
         if hasattr(self.session.cache, "clear"):
             self.session.cache.clear()
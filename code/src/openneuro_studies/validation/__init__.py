@@ -10,23 +10,33 @@ Output structure:
 """
 
 from openneuro_studies.validation.bids_validator import (
+    VALIDATION_CACHE_FILE,
     VALIDATOR_OUTPUT_DIR,
+    ValidationCache,
     ValidationResult,
     ValidationStatus,
     find_validator,
     get_validator_version,
     needs_validation,
     run_validation,
+    run_validation_batch,
+    study_content_key,
     update_studies_tsv_validation,
+    update_studies_tsv_validation_bulk,
 )
 
 __all__ = [
+    "VALIDATION_CACHE_FILE",
     "VALIDATOR_OUTPUT_DIR",
+    "ValidationCache",
     "ValidationResult",
     "ValidationStatus",
     "find_validator",
     "get_validator_version",
     "needs_validation",
     "run_validation",
+    "run_validation_batch",
+    "study_content_key",
     "update_studies_tsv_validation",
+    "update_studies_tsv_validation_bulk",
 ]
@@ -11,10 +11,18 @@ Output structure:
 """
 
 import csv
+import functools
+import hashlib
+import io
 import json
 import logging
+import os
+import shlex
 import shutil
 import subprocess
+import tempfile
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
@@ -22,9 +30,21 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Try to import pygit2 for in-process repository reads, but don't require it
+try:
+    import pygit2
+
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
+    pygit2 = None  # type: ignore[assignment]
+
 # Output directory name under derivatives/
 VALIDATOR_OUTPUT_DIR = "bids-validator"
 
+# Record of the study content each study was last validated at
+VALIDATION_CACHE_FILE = Path(".openneuro-studies/cache/validation.json")
+
 
 class ValidationStatus(Enum):
     """BIDS validation status values for studies.tsv."""
@@ -47,9 +67,12 @@ class ValidationResult:
     validator_version: Optional[str] = None
 
 
+@functools.lru_cache(maxsize=1)
 def find_validator() -> Optional[tuple[list[str], str]]:
     """Find the BIDS validator executable.
 
+    The lookup is done once per process; the result is cached.
+
     Tries in order:
     1. uvx bids-validator-deno (preferred, fast via uv)
     2. bids-validator-deno (pip-installed deno version)
@@ -94,6 +117,9 @@ def find_validator() -> Optional[tuple[list[str], str]]:
 def get_validator_version(validator_cmd: list[str], timeout: int = 30) -> Optional[str]:
     """Get the version of the BIDS validator.
 
+    Successful lookups are cached per command, so validating many studies
+    starts the validator for --version only once.
+
     Args:
         validator_cmd: Validator command arguments
         timeout: Timeout in seconds
@@ -102,33 +128,211 @@ def get_validator_version(validator_cmd: list[str], timeout: int = 30) -> Option
         Version string or None if failed
     """
     try:
-        result = subprocess.run(
-            validator_cmd + ["--version"],
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-        )
-        if result.returncode == 0 and result.stdout:
-            return result.stdout.strip()
+        return _query_validator_version(tuple(validator_cmd), timeout)
+    except (subprocess.CalledProcessError, ValueError):
         return None
     except Exception as e:
-        logger.warning(f"Failed to get validator version: {e}")
+        logger.warning("Failed to get validator version: %s", e)
         return None
 
 
-def needs_validation(study_path: Path) -> bool:
+@functools.lru_cache(maxsize=8)
+def _query_validator_version(validator_cmd: tuple[str, ...], timeout: int) -> str:
+    """Run the validator with --version.
+
+    Raises instead of returning None so that failures are not cached.
+    """
+    result = subprocess.run(
+        [*validator_cmd, "--version"],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        check=True,
+    )
+    version = result.stdout.strip()
+    if not version:
+        raise ValueError("empty --version output")
+    return version
+
+
+class ValidationCache:
+    """Content each study was last validated at, kept in a small JSON file.
+
+    Entries map study ID to the study's content key (see study_content_key()),
+    the validator version used, and the resulting status. Comparing keys
+    replaces walking git history for every study on each run.
+    """
+
+    _CACHE_VERSION = 1
+
+    def __init__(self, path: Path = VALIDATION_CACHE_FILE):
+        self.path = path
+        self._entries: dict[str, dict] = self._load()
+
+    def _load(self) -> dict[str, dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Failed to load validation cache %s: %s", self.path, e)
+            return {}
+        if not isinstance(data, dict) or data.get("version") != self._CACHE_VERSION:
+            logger.info("Ignoring validation cache %s (version mismatch)", self.path)
+            return {}
+        studies = data.get("studies", {})
+        return studies if isinstance(studies, dict) else {}
+
+    def is_current(
+        self, study_id: str, content_key: str, validator_version: Optional[str] = None
+    ) -> Optional[bool]:
+        """Whether the study was last validated at this content and validator version.
+
+        Returns:
+            None if the study has no entry, else True/False. An entry recorded
+            without a validator version matches any version.
+        """
+        entry = self._entries.get(study_id)
+        if entry is None:
+            return None
+        if entry.get("content") != content_key:
+            return False
+        cached_version = entry.get("validator_version")
+        return validator_version is None or cached_version in (None, validator_version)
+
+    def record(
+        self,
+        study_id: str,
+        content_key: str,
+        validator_version: Optional[str] = None,
+        status: Optional[ValidationStatus] = None,
+    ) -> None:
+        """Remember that the study has been validated at content_key."""
+        self._entries[study_id] = {
+            "content": content_key,
+            "validator_version": validator_version,
+            "status": status.value if status is not None else None,
+        }
+
+    def save(self) -> None:
+        """Write the cache file (atomically); failures are logged, not raised."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            _write_text_atomic(
+                self.path, json.dumps({"version": self._CACHE_VERSION, "studies": self._entries})
+            )
+        except OSError as e:
+            logger.warning("Failed to save validation cache %s: %s", self.path, e)
+
+
+def _write_text_atomic(path: Path, text: str) -> None:
+    """Write text to path via a temporary file, so readers never see a partial file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def study_content_key(study_path: Path) -> Optional[str]:
+    """Hash of the study's committed content, excluding validation output.
+
+    Lists the top-level entries and the derivatives/ entries of HEAD (tree,
+    blob and submodule SHAs) in one git call, leaving out
+    derivatives/bids-validator so that committing validation results does
+    not change the key.
+
+    Returns:
+        Hex digest, or None if the study is not a git repository with commits
+    """
+    lines = _pygit2_ls_tree(study_path) if PYGIT2_AVAILABLE else None
+    if lines is None:
+        try:
+            result = subprocess.run(
+                ["git", "-C", str(study_path), "ls-tree", "HEAD", "--", ".", "derivatives/"],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.debug("Cannot list tree of %s: %s", study_path, e)
+            return None
+        lines = result.stdout.splitlines()
+    excluded = f"derivatives/{VALIDATOR_OUTPUT_DIR}"
+    entries = [line for line in lines if line.split("\t", 1)[-1] != excluded]
+    return hashlib.sha1("\n".join(entries).encode()).hexdigest()
+
+
+def _pygit2_ls_tree(study_path: Path) -> Optional[list[str]]:
+    """In-process variant of the ls-tree in study_content_key(), without spawning git.
+
+    Produces the same lines as git ls-tree (derivatives/ replaced by its
+    entries). Returns None if pygit2 cannot read the repository, so that the
+    caller falls back to git.
+    """
+    try:
+        repo = pygit2.Repository(str(study_path))
+        tree = repo.head.peel(pygit2.Tree)
+    except (pygit2.GitError, KeyError):
+        return None
+
+    lines: list[str] = []
+    for entry in tree:
+        if entry.name == "derivatives" and isinstance(entry, pygit2.Tree):
+            lines.extend(
+                f"{sub.filemode:06o} {sub.type_str} {sub.id}\tderivatives/{sub.name}"
+                for sub in entry
+            )
+        else:
+            lines.append(f"{entry.filemode:06o} {entry.type_str} {entry.id}\t{entry.name}")
+    return lines
+
+
+def needs_validation(
+    study_path: Path,
+    cache: Optional[ValidationCache] = None,
+    validator_version: Optional[str] = None,
+) -> bool:
     """Check if a study needs (re)validation.
 
     Returns True if:
     - No validation output exists
     - Study has commits newer than the last validation
+    - With a cache: the study's content (or the validator version) differs
+      from what it was last validated at
+
+    With a cache, one git call computes the study's content key; studies the
+    cache does not know yet fall back to the git history check, and are
+    recorded when found up to date.
 
     Args:
         study_path: Path to study directory
+        cache: Optional cache of previously validated study content
+        validator_version: Version of the validator about to be run
 
     Returns:
         True if validation should be run
     """
+    version_file = study_path / "derivatives" / VALIDATOR_OUTPUT_DIR / "version.txt"
+    if cache is not None and version_file.exists():
+        content_key = study_content_key(study_path)
+        if content_key is not None:
+            current = cache.is_current(study_path.name, content_key, validator_version)
+            if current is not None:
+                return not current
+            needed = _needs_validation_from_history(study_path)
+            if not needed:
+                cache.record(study_path.name, content_key)
+            return needed
+
+    return _needs_validation_from_history(study_path)
+
+
+def _needs_validation_from_history(study_path: Path) -> bool:
+    """Check git history for commits since the validation output was last committed."""
     validator_dir = study_path / "derivatives" / VALIDATOR_OUTPUT_DIR
     version_file = validator_dir / "version.txt"
 
@@ -183,7 +387,7 @@ def needs_validation(study_path: Path) -> bool:
         return bool(result.stdout.strip())
 
     except subprocess.CalledProcessError as e:
-        logger.debug(f"Git command failed for {study_path}: {e}")
+        logger.debug("Git command failed for %s: %s", study_path, e)
         # If git fails, assume validation is needed
         return True
 
@@ -192,6 +396,7 @@ def run_validation(
     study_path: Path,
     validator_cmd: Optional[list[str]] = None,
     timeout: int = 600,
+    native_text: bool = False,
 ) -> ValidationResult:
     """Run BIDS validation on a study dataset.
 
@@ -200,10 +405,16 @@ def run_validation(
         report.json   - Machine-readable results
         report.txt    - Human-readable summary
 
+    The validator runs once, with --json, and report.txt is formatted from
+    that report. The validator's own text output takes a second full run over
+    the dataset; it is used only with native_text, or when the JSON run
+    produced no report (so its error message is kept).
+
     Args:
         study_path: Path to study directory
         validator_cmd: Optional validator command (auto-detected if None)
         timeout: Timeout in seconds (default 10 minutes)
+        native_text: Run the validator a second time for its native text report
 
     Returns:
         ValidationResult with status and outputs
@@ -220,7 +431,7 @@ def run_validation(
                 text_output="No BIDS validator found. Install with: pip install bids-validator",
             )
         validator_cmd, validator_type = found
-        logger.info(f"Using {validator_type} for validation")
+        logger.info("Using %s for validation", validator_type)
     else:
         validator_type = "custom"
 
@@ -235,53 +446,57 @@ def run_validation(
     # Get and save validator version
     validator_version = get_validator_version(validator_cmd)
     if validator_version:
-        with open(version_path, "w") as f:
-            f.write(validator_version + "\n")
-        logger.info(f"Validator version: {validator_version}")
+        _write_text_atomic(version_path, validator_version + "\n")
+        logger.info("Validator version: %s", validator_version)
 
     try:
-        # Run 1: Get JSON output for machine-readable results
+        # Run 1: Get JSON output for machine-readable results. Stream it straight
+        # to disk instead of buffering a possibly huge report in memory; the file
+        # replaces report.json only if it parses.
         json_cmd = validator_cmd + [str(study_path), "--json"]
-        logger.info(f"Running (JSON): {' '.join(json_cmd)}")
-
-        json_result = subprocess.run(
-            json_cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            cwd=study_path.parent,
-        )
-
-        # Parse JSON output from stdout
-        json_data = None
-        if json_result.stdout and json_result.stdout.strip():
-            try:
-                json_data = json.loads(json_result.stdout)
-                # Write to file for persistence
-                with open(json_output_path, "w") as f:
-                    json.dump(json_data, f, indent=2)
-            except json.JSONDecodeError:
-                logger.debug(f"Failed to parse JSON from stdout: {json_result.stdout[:200]}")
-
-        # Run 2: Get native text output for human-readable report
-        text_cmd = validator_cmd + [str(study_path)]
-        logger.info(f"Running (text): {' '.join(text_cmd)}")
-
-        text_result = subprocess.run(
-            text_cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            cwd=study_path.parent,
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Running (JSON): %s", shlex.join(json_cmd))
+
+        partial_json_path = output_dir / "report.json.partial"
+        try:
+            with open(partial_json_path, "wb") as f:
+                json_result = subprocess.run(
+                    json_cmd,
+                    stdout=f,
+                    stderr=subprocess.DEVNULL,
+                    timeout=timeout,
+                    cwd=study_path.parent,
+                )
+            json_data = _load_json_report(partial_json_path)
+            if json_data is not None:
+                os.replace(partial_json_path, json_output_path)
+        finally:
+            partial_json_path.unlink(missing_ok=True)
+
+        # Split issues by severity once, for both the counts and report.txt
+        issues = _split_issues(json_data) if json_data is not None else None
+
+        if json_data is not None and issues is not None and not native_text:
+            text_output = _format_text_report(json_data, issues, validator_version)
+        else:
+            # Run 2: Get native text output for human-readable report
+            text_cmd = validator_cmd + [str(study_path)]
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Running (text): %s", shlex.join(text_cmd))
+
+            text_result = subprocess.run(
+                text_cmd,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                cwd=study_path.parent,
+            )
+            text_output = text_result.stdout or text_result.stderr or ""
 
-        # Write native validator text output directly
-        text_output = text_result.stdout or text_result.stderr or ""
-        with open(text_output_path, "w") as f:
-            f.write(text_output)
+        _write_text_atomic(text_output_path, text_output)
 
         # Determine status from JSON data
-        status, error_count, warning_count = _parse_validation_result(json_data, json_result)
+        status, error_count, warning_count = _parse_validation_result(issues, json_result)
 
         return ValidationResult(
             status=status,
@@ -293,7 +508,7 @@ def run_validation(
         )
 
     except subprocess.TimeoutExpired:
-        logger.error(f"Validation timed out after {timeout}s for {study_path.name}")
+        logger.error("Validation timed out after %ss for %s", timeout, study_path.name)
         text_output = (
             f"Validation timed out after {timeout} seconds.\n"
             "This may happen if:\n"
@@ -303,8 +518,7 @@ def run_validation(
             "\nConsider running with --timeout to increase the limit,\n"
             "or ensure sourcedata content is available."
         )
-        with open(text_output_path, "w") as f:
-            f.write(text_output)
+        _write_text_atomic(text_output_path, text_output)
         return ValidationResult(
             status=ValidationStatus.NOT_AVAILABLE,
             error_count=0,
@@ -314,10 +528,9 @@ def run_validation(
         )
 
     except Exception as e:
-        logger.error(f"Validation failed for {study_path.name}: {e}")
+        logger.error("Validation failed for %s: %s", study_path.name, e)
         text_output = f"Validation failed: {e}"
-        with open(text_output_path, "w") as f:
-            f.write(text_output)
+        _write_text_atomic(text_output_path, text_output)
         return ValidationResult(
             status=ValidationStatus.NOT_AVAILABLE,
             error_count=0,
@@ -327,28 +540,80 @@ def run_validation(
         )
 
 
+def run_validation_batch(
+    study_paths: Sequence[Path],
+    validator_cmd: Optional[list[str]] = None,
+    timeout: int = 600,
+    max_workers: int = 1,
+    native_text: bool = False,
+) -> Iterator[tuple[Path, ValidationResult]]:
+    """Run BIDS validation on several studies concurrently.
+
+    Each validation is an external validator process writing only to its own
+    study's derivatives/bids-validator/, so threads suffice to keep up to
+    max_workers validators running at once.
+
+    Args:
+        study_paths: Paths to study directories
+        validator_cmd: Optional validator command (auto-detected once if None)
+        timeout: Timeout per study in seconds
+        max_workers: Number of validations to run at once
+        native_text: Passed to run_validation()
+
+    Yields:
+        (study_path, ValidationResult) pairs in the order of study_paths,
+        each as soon as it and all before it have finished
+    """
+    if validator_cmd is None:
+        found = find_validator()
+        if found is not None:
+            validator_cmd = found[0]
+
+    def validate_one(study_path: Path) -> ValidationResult:
+        return run_validation(
+            study_path, validator_cmd=validator_cmd, timeout=timeout, native_text=native_text
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        yield from zip(study_paths, executor.map(validate_one, study_paths), strict=True)
+
+
+def _load_json_report(path: Path) -> Optional[dict]:
+    """Load validator --json output from a file, or None if empty or not JSON."""
+    with open(path, "rb") as f:
+        content = f.read()
+    if not content.strip():
+        return None
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        logger.debug("Failed to parse JSON from stdout: %r", content[:200])
+        return None
+    return data if isinstance(data, dict) else None
+
+
 def _parse_validation_result(
-    json_data: Optional[dict],
+    issues: Optional[tuple[list[dict], list[dict]]],
     result: subprocess.CompletedProcess,
 ) -> tuple[ValidationStatus, int, int]:
     """Parse validation result to determine status.
 
+    Args:
+        issues: (errors, warnings) from _split_issues(), or None without JSON output
+        result: Completed validator run
+
     Returns:
         Tuple of (status, error_count, warning_count)
     """
-    if json_data is None:
+    if issues is None:
         # No JSON output - check exit code
         if result.returncode == 0:
             return ValidationStatus.VALID, 0, 0
         else:
             return ValidationStatus.NOT_AVAILABLE, 0, 0
 
-    issues = json_data.get("issues", {})
-    errors = issues.get("errors", [])
-    warnings = issues.get("warnings", [])
-
-    error_count = len(errors)
-    warning_count = len(warnings)
+    error_count = len(issues[0])
+    warning_count = len(issues[1])
 
     if error_count > 0:
         return ValidationStatus.ERRORS, error_count, warning_count
@@ -358,6 +623,71 @@ def _parse_validation_result(
         return ValidationStatus.VALID, error_count, warning_count
 
 
+def _split_issues(json_data: dict) -> tuple[list[dict], list[dict]]:
+    """Return (errors, warnings) from a validator JSON report.
+
+    Handles both the legacy node validator layout (issues.errors and
+    issues.warnings lists) and the deno validator layout (one issues.issues
+    list whose entries carry a severity).
+    """
+    issues = json_data.get("issues", {})
+    if "issues" in issues:
+        errors = []
+        warnings = []
+        for issue in issues["issues"]:
+            severity = issue.get("severity")
+            if severity == "error":
+                errors.append(issue)
+            elif severity == "warning":
+                warnings.append(issue)
+        return errors, warnings
+    return issues.get("errors", []), issues.get("warnings", [])
+
+
+def _format_text_report(
+    json_data: dict,
+    issues: tuple[list[dict], list[dict]],
+    validator_version: Optional[str] = None,
+) -> str:
+    """Format a human-readable report.txt from the validator's JSON report.
+
+    Lists one line per issue (code and message, then affected files) under
+    an errors and a warnings heading, followed by a count summary. issues is
+    the report's (errors, warnings) as split by _split_issues().
+    """
+    errors, warnings = issues
+    code_messages = json_data.get("issues", {}).get("codeMessages", {})
+
+    out = io.StringIO()
+    if validator_version:
+        out.write(f"bids-validator {validator_version}\n\n")
+    for heading, listed in (("Errors", errors), ("Warnings", warnings)):
+        if not listed:
+            continue
+        out.write(f"{heading} ({len(listed)}):\n")
+        for issue in listed:
+            code = issue.get("code") or issue.get("key") or "UNKNOWN"
+            message = (
+                issue.get("reason")
+                or issue.get("issueMessage")
+                or code_messages.get(code)
+                or issue.get("message")
+                or ""
+            )
+            out.write(f"  [{code}] {' '.join(str(message).split())}\n")
+            if issue.get("location"):
+                out.write(f"      {issue['location']}\n")
+            for file_entry in issue.get("files") or []:
+                path = (file_entry.get("file") or {}).get("relativePath") or file_entry.get(
+                    "relativePath"
+                )
+                if path:
+                    out.write(f"      {path}\n")
+        out.write("\n")
+    out.write(f"{len(errors)} errors, {len(warnings)} warnings\n")
+    return out.getvalue()
+
+
 def update_studies_tsv_validation(
     studies_tsv_path: Path,
     study_id: str,
@@ -370,38 +700,76 @@ def update_studies_tsv_validation(
         study_id: Study ID to update
         status: Validation status to set
     """
+    update_studies_tsv_validation_bulk(studies_tsv_path, {study_id: status})
+
+
+def update_studies_tsv_validation_bulk(
+    studies_tsv_path: Path,
+    updates: dict[str, ValidationStatus],
+) -> None:
+    """Update the bids_valid column in studies.tsv for many studies at once.
+
+    Reads and rewrites the file once for all updates, rather than once per study.
+
+    Args:
+        studies_tsv_path: Path to studies.tsv
+        updates: Mapping of study ID to validation status to set
+    """
+    if not updates:
+        return
+
     if not studies_tsv_path.exists():
-        logger.warning(f"studies.tsv not found at {studies_tsv_path}")
+        logger.warning("studies.tsv not found at %s", studies_tsv_path)
         return
 
-    # Read existing TSV
-    rows = []
-    fieldnames = None
+    # Read existing TSV as plain rows: only two columns are looked at, so there
+    # is no need for a dict per row
     with open(studies_tsv_path, newline="") as f:
-        reader = csv.DictReader(f, delimiter="\t")
-        fieldnames = reader.fieldnames
-        rows = list(reader)
+        rows = list(csv.reader(f, delimiter="\t"))
 
-    if fieldnames is None or "bids_valid" not in fieldnames:
+    header = rows[0] if rows else []
+    if "bids_valid" not in header:
         logger.warning("bids_valid column not found in studies.tsv")
         return
-
-    # Update the matching row
-    updated = False
-    for row in rows:
-        if row.get("study_id") == study_id:
-            row["bids_valid"] = status.value
-            updated = True
-            break
-
+    valid_col = header.index("bids_valid")
+    id_col = header.index("study_id") if "study_id" in header else None
+
+    # Update the matching rows
+    updated = []
+    for row in rows[1:]:
+        if id_col is None or id_col >= len(row):
+            continue
+        status = updates.get(row[id_col])
+        if status is not None:
+            row.extend([""] * (valid_col + 1 - len(row)))
+            row[valid_col] = status.value
+            updated.append(row[id_col])
+
+    for study_id in updates.keys() - set(updated):
+        logger.warning("Study %s not found in studies.tsv", study_id)
     if not updated:
-        logger.warning(f"Study {study_id} not found in studies.tsv")
         return
 
-    # Write back
-    with open(studies_tsv_path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, delimiter="\t")
-        writer.writeheader()
-        writer.writerows(rows)
-
-    logger.info(f"Updated bids_valid={status.value} for {study_id} in studies.tsv")
+    # Write back atomically: a crash mid-write must not leave a truncated studies.tsv
+    with tempfile.NamedTemporaryFile(
+        "w",
+        newline="",
+        dir=studies_tsv_path.parent,
+        prefix=f".{studies_tsv_path.name}.",
+        suffix=".tmp",
+        delete=False,
+    ) as f:
+        tmp_path = Path(f.name)
+        try:
+            csv.writer(f, delimiter="\t").writerows(rows)
+        except BaseException:
+            f.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+    shutil.copymode(studies_tsv_path, tmp_path)
+    os.replace(tmp_path, studies_tsv_path)
+
+    for study_id in updated:
+        logger.info(
+            "Updated bids_valid=%s for %s in studies.tsv", updates[study_id].value, study_id
+        )
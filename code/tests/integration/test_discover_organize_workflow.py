@@ -22,6 +22,11 @@ Derivative datasets:
 
 Each raw dataset will automatically discover matching derivatives from OpenNeuroDerivatives.
 
+Integration tests can run in parallel with pytest-xdist:
+    pytest -n auto --dist loadgroup -m integration
+The tests in this module share one organized workspace (a session fixture), so
+they are kept on a single worker; other integration modules run alongside.
+
 Note on GITHUB_TOKEN:
 - The discovery workflow works WITHOUT token set (uses unauthenticated API)
 - May hit rate limits faster without token (60/hour vs 5000/hour)
@@ -29,20 +34,62 @@ Note on GITHUB_TOKEN:
 """
 
 import json
+import os
 import shutil
 import subprocess
 import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
+from click.testing import CliRunner
+
+from openneuro_studies.cli.main import cli
+
+# Share the session-scoped workspace: building it is the network-bound part
+pytestmark = pytest.mark.xdist_group("discover_organize_workflow")
 
 
-def run_cli(args: list[str], **kwargs) -> subprocess.CompletedProcess:
-    """Run openneuro-studies CLI via python -m.
+def run_cli(
+    args: list[str],
+    cwd: Path | None = None,
+    check: bool = False,
+    isolated: bool = False,
+    **kwargs,
+) -> subprocess.CompletedProcess:
+    """Run openneuro-studies CLI in-process via Click's CliRunner.
 
-    This ensures the CLI is accessible regardless of PATH configuration.
+    Avoids a fresh interpreter (and re-import of all CLI modules) per call.
+    Accepts the subset of subprocess.run() arguments the tests use; output is
+    always captured. With isolated=True, runs python -m in a separate process
+    instead, passing kwargs on to subprocess.run().
     """
-    return subprocess.run([sys.executable, "-m", "openneuro_studies.cli.main"] + args, **kwargs)
+    if isolated:
+        return subprocess.run(
+            [sys.executable, "-m", "openneuro_studies.cli.main", *args],
+            cwd=cwd,
+            check=check,
+            **kwargs,
+        )
+
+    original_cwd = os.getcwd()
+    try:
+        if cwd is not None:
+            os.chdir(cwd)
+        result = CliRunner().invoke(cli, args)
+    finally:
+        os.chdir(original_cwd)
+
+    stderr = ""
+    if result.exception is not None and not isinstance(result.exception, SystemExit):
+        stderr = "".join(traceback.format_exception(result.exception))
+    completed = subprocess.CompletedProcess(
+        ["openneuro-studies", *args], result.exit_code, stdout=result.output, stderr=stderr
+    )
+    if check:
+        completed.check_returncode()
+    return completed
 
 
 def verify_gitlinks_for_submodules(repo_path: Path) -> None:
@@ -128,53 +175,48 @@ EXPECTED_DERIVATIVE_DATASETS = [
 ]
 
 
-@pytest.fixture
-def test_workspace(tmp_path: Path) -> Path:
-    """Create temporary workspace for integration test.
-
-    Args:
-        tmp_path: pytest temporary directory fixture
-
-    Returns:
-        Path to test workspace (directory will be created by init command)
-    """
-    workspace = tmp_path / "openneuro-test"
-    # Don't create the directory - let init command create it
-    return workspace
-
-
 @pytest.mark.integration
 @pytest.mark.ai_generated
-def test_full_workflow(test_workspace: Path) -> None:
-    """Test complete workflow: init → discover → organize.
+def test_cli_entry_point() -> None:
+    """Smoke-test the CLI as a separate process (the other tests run it in-process)."""
+    result = run_cli(["--help"], isolated=True, capture_output=True, text=True, check=True)
+    for command in ("init", "discover", "organize"):
+        assert command in result.stdout
 
-    This integration test:
-    1. Initializes a new OpenNeuroStudies repository
-    2. Discovers test datasets from GitHub (raw and derivatives)
-    3. Organizes them into study structures
-    4. Verifies proper submodule registration at both levels
+
+@pytest.fixture(scope="session")
+def test_workspace(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Initialize, discover and organize the test datasets once per session.
+
+    Discovery and organization hit the GitHub API and create many submodules,
+    so the organized workspace is shared by all tests in the session rather
+    than rebuilt for each one.
 
     Args:
-        test_workspace: Temporary test workspace path
+        tmp_path_factory: pytest session temporary directory factory
+
+    Returns:
+        Path to the organized test workspace
     """
     # Check for GITHUB_TOKEN - required to avoid rate limits during testing
-    import os
-
     if not os.environ.get("GITHUB_TOKEN"):
         pytest.skip("GITHUB_TOKEN environment variable required for integration tests")
 
+    # Don't create the directory - let init command create it
+    workspace = tmp_path_factory.mktemp("workflow") / "openneuro-test"
+
     # Step 1: Initialize repository
     print("\n=== Step 1: Initialize repository ===")
     result = run_cli(
-        ["init", str(test_workspace)],
-        cwd=test_workspace.parent,  # Run from parent, pass path as argument
+        ["init", str(workspace)],
+        cwd=workspace.parent,  # Run from parent, pass path as argument
         capture_output=True,
         text=True,
         check=True,
     )
     assert result.returncode == 0
-    assert (test_workspace / ".openneuro-studies" / "config.yaml").exists()
-    assert (test_workspace / ".git").exists()
+    assert (workspace / ".openneuro-studies" / "config.yaml").exists()
+    assert (workspace / ".git").exists()
 
     # Step 2: Discover datasets (with filter for raw datasets + include-derivatives)
     print("\n=== Step 2: Discover datasets ===")
@@ -184,7 +226,7 @@ def test_full_workflow(test_workspace: Path) -> None:
 
     result = run_cli(
         discover_args,
-        cwd=test_workspace,
+        cwd=workspace,
         capture_output=True,
         text=True,
         check=False,  # Don't raise on error - we want to see output
@@ -194,6 +236,41 @@ def test_full_workflow(test_workspace: Path) -> None:
         print(f"STDERR:\n{result.stderr}")
         raise AssertionError(f"Discover failed with exit code {exit_code}")
 
+    # Step 3: Organize datasets
+    print("\n=== Step 3: Organize datasets ===")
+    # Test with parallel workers to verify --workers functionality
+    organize_args = ["organize", "--workers", "5"]
+    result = run_cli(
+        organize_args,
+        cwd=workspace,
+        capture_output=True,
+        text=True,
+        check=False,  # Don't raise - we want to see output
+    )
+    if result.returncode != 0:
+        print(f"STDOUT:\n{result.stdout}")
+        print(f"STDERR:\n{result.stderr}")
+    assert result.returncode == 0, f"Organize failed with exit code {result.returncode}"
+
+    return workspace
+
+
+@pytest.mark.integration
+@pytest.mark.ai_generated
+def test_full_workflow(test_workspace: Path) -> None:
+    """Test complete workflow: init → discover → organize.
+
+    This integration test verifies the workspace built by the test_workspace
+    fixture, which:
+    1. Initializes a new OpenNeuroStudies repository
+    2. Discovers test datasets from GitHub (raw and derivatives)
+    3. Organizes them into study structures
+
+    and then checks proper submodule registration at both levels.
+
+    Args:
+        test_workspace: Organized test workspace path
+    """
     # Check discovered datasets file
     discovered_file = test_workspace / ".openneuro-studies" / "discovered-datasets.json"
     assert discovered_file.exists()
@@ -220,22 +297,6 @@ def test_full_workflow(test_workspace: Path) -> None:
             expected_id in deriv_ids
         ), f"Should discover derivative {expected_id} via --include-derivatives"
 
-    # Step 3: Organize datasets (with parallel workers if specified)
-    print("\n=== Step 3: Organize datasets ===")
-    # Test with parallel workers to verify --workers functionality
-    organize_args = ["organize", "--workers", "5"]
-    result = run_cli(
-        organize_args,
-        cwd=test_workspace,
-        capture_output=True,
-        text=True,
-        check=False,  # Don't raise - we want to see output
-    )
-    if result.returncode != 0:
-        print(f"STDOUT:\n{result.stdout}")
-        print(f"STDERR:\n{result.stderr}")
-    assert result.returncode == 0, f"Organize failed with exit code {result.returncode}"
-
     # Step 4: Verify organization structure
     print("\n=== Step 4: Verify organization ===")
 
@@ -245,6 +306,9 @@ def test_full_workflow(test_workspace: Path) -> None:
 
     gitmodules_content = parent_gitmodules.read_text()
 
+    # Studies whose gitlinks to verify; checked together below
+    studies_to_verify: set[Path] = set()
+
     # Check each raw dataset has a corresponding study
     for dataset_id in raw_ids:
         study_id = f"study-{dataset_id}"
@@ -274,8 +338,7 @@ def test_full_workflow(test_workspace: Path) -> None:
         ), f"{study_id} should have sourcedata/raw submodule"
 
         # Verify gitlinks for all submodules (FR-004a)
-        print(f"  Verifying gitlinks for {study_id}...")
-        verify_gitlinks_for_submodules(study_path)
+        studies_to_verify.add(study_path)
 
         # Note: We don't check `git submodule status` because we use gitlinks without
         # cloning (no git submodule init). The .gitmodules check above is sufficient.
@@ -315,8 +378,12 @@ def test_full_workflow(test_workspace: Path) -> None:
 
         # Verify gitlinks for this study's submodules (including derivatives)
         if (study_path / ".gitmodules").exists():
-            print(f"  Verifying gitlinks for {study_id} (includes derivatives)...")
-            verify_gitlinks_for_submodules(study_path)
+            studies_to_verify.add(study_path)
+
+    # Each verification runs git ls-tree; overlap them across studies
+    print(f"\n=== Verifying gitlinks for {len(studies_to_verify)} studies ===")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(verify_gitlinks_for_submodules, sorted(studies_to_verify)))
 
     # Step 5: Verify parent .gitmodules has all studies
     print("\n=== Step 5: Verify all studies in parent .gitmodules ===")
@@ -363,7 +430,7 @@ def test_full_workflow(test_workspace: Path) -> None:
 @pytest.mark.integration
 @pytest.mark.datalad_install
 @pytest.mark.ai_generated
-def test_datalad_recursive_install(test_workspace: Path) -> None:
+def test_datalad_recursive_install(test_workspace: Path, tmp_path: Path) -> None:
     """Test that datalad install -r works on organized structure.
 
     This test is marked with @pytest.mark.datalad_install and should be run explicitly:
@@ -377,17 +444,18 @@ def test_datalad_recursive_install(test_workspace: Path) -> None:
     Note: This test takes longer (~20-30 seconds) so it's not run by default.
 
     Args:
-        test_workspace: Temporary test workspace path from test_full_workflow fixture
+        test_workspace: Organized test workspace path (shared; left untouched)
+        tmp_path: pytest temporary directory fixture
     """
-    # First run the full workflow to set up the structure
-    print("\n=== Running full workflow first ===")
-    test_full_workflow(test_workspace)
+    # Install into a private copy: the session workspace is shared with other tests
+    workspace = tmp_path / test_workspace.name
+    shutil.copytree(test_workspace, workspace, symlinks=True)
 
     # Now perform recursive DataLad install
     print("\n=== Running datalad install -r -R2 -J5 ===")
     result = subprocess.run(
         ["datalad", "install", "-r", "-R2", "-J5", "."],
-        cwd=test_workspace,
+        cwd=workspace,
         capture_output=True,
         text=True,
         check=False,
@@ -402,7 +470,7 @@ def test_datalad_recursive_install(test_workspace: Path) -> None:
 
     # Verify each study has .git/ directories for its subdatasets
     print("\n=== Verifying installed subdatasets ===")
-    for study_dir in sorted(test_workspace.glob("study-*")):
+    for study_dir in sorted(workspace.glob("study-*")):
         print(f"\nChecking {study_dir.name}:")
 
         # Check sourcedata/ subdatasets
@@ -410,9 +478,7 @@ def test_datalad_recursive_install(test_workspace: Path) -> None:
             if subds_dir.is_dir():
                 assert (
                     subds_dir / ".git"
-                ).exists(), (
-                    f"{subds_dir.relative_to(test_workspace)} should have .git/ after install"
-                )
+                ).exists(), f"{subds_dir.relative_to(workspace)} should have .git/ after install"
                 print(f"  ✓ {subds_dir.relative_to(study_dir)} has .git/")
 
         # Check derivatives/ subdatasets
@@ -423,7 +489,7 @@ def test_datalad_recursive_install(test_workspace: Path) -> None:
                     assert (
                         subds_dir / ".git"
                     ).exists(), (
-                        f"{subds_dir.relative_to(test_workspace)} should have .git/ after install"
+                        f"{subds_dir.relative_to(workspace)} should have .git/ after install"
                     )
                     print(f"  ✓ {subds_dir.relative_to(study_dir)} has .git/")
 
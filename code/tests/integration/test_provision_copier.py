@@ -10,41 +10,24 @@ These tests require copier to be installed:
     pip install copier
 """
 
-import shutil
 import subprocess
-import sys
 from pathlib import Path
 
 import pytest
 
-
-def is_copier_available() -> bool:
-    """Check if copier is installed and available."""
-    # Check if copier is in PATH
-    if shutil.which("copier") is not None:
-        return True
-    # Also check if we can run copier via python -m
-    try:
-        result = subprocess.run(
-            [sys.executable, "-m", "copier", "--version"],
-            capture_output=True,
-            text=True,
-        )
-        return result.returncode == 0
-    except Exception:
-        return False
+from openneuro_studies.provision.provisioner import _resolve_copier
 
 
 def get_copier_cmd() -> list[str]:
-    """Get the command to run copier."""
-    if shutil.which("copier") is not None:
-        return ["copier"]
-    return [sys.executable, "-m", "copier"]
+    """Get the command to run copier (same resolution as the provisioner)."""
+    cmd = _resolve_copier()
+    assert cmd is not None
+    return list(cmd)
 
 
 # Skip entire module if copier not available
 pytestmark = pytest.mark.skipif(
-    not is_copier_available(),
+    _resolve_copier() is None,
     reason="copier not installed (pip install copier)",
 )
 
@@ -1,12 +1,14 @@
 """Unit tests for GitHub API client."""
 
-import base64
+import io
 from typing import Any
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
 
-from openneuro_studies.utils import GitHubAPIError, GitHubClient
+from openneuro_studies.utils import GitHubAPIError, GitHubClient, github_client
 
 
 @pytest.mark.unit
@@ -34,8 +36,11 @@ class TestGitHubClient:
         assert "Authorization" not in client.session.headers
 
     @patch("openneuro_studies.utils.github_client.CachedSession")
-    def test_list_repositories(self, mock_session_class: Mock) -> None:
-        """Test listing repositories from an organization."""
+    def test_list_repositories(
+        self, mock_session_class: Mock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test listing repositories from an organization (REST, unauthenticated)."""
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
         # Setup mock
         mock_session = MagicMock()
         mock_session_class.return_value = mock_session
@@ -48,7 +53,7 @@ class TestGitHubClient:
         ]
         mock_session.get.return_value = mock_response
 
-        client = GitHubClient(token="test_token")
+        client = GitHubClient()
         repos = client.list_repositories("TestOrg")
 
         assert len(repos) == 2
@@ -56,8 +61,11 @@ class TestGitHubClient:
         assert repos[1]["name"] == "ds000002"
 
     @patch("openneuro_studies.utils.github_client.CachedSession")
-    def test_list_repositories_with_filter(self, mock_session_class: Mock) -> None:
-        """Test filtering repositories by dataset ID."""
+    def test_list_repositories_with_filter(
+        self, mock_session_class: Mock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test filtering repositories by dataset ID (REST, unauthenticated)."""
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
         # Setup mock
         mock_session = MagicMock()
         mock_session_class.return_value = mock_session
@@ -71,13 +79,137 @@ class TestGitHubClient:
         ]
         mock_session.get.return_value = mock_response
 
-        client = GitHubClient(token="test_token")
+        client = GitHubClient()
         repos = client.list_repositories("TestOrg", dataset_filter=["ds000001", "ds000003"])
 
         assert len(repos) == 2
         assert repos[0]["name"] == "ds000001"
         assert repos[1]["name"] == "ds000003"
 
+    @patch("openneuro_studies.utils.github_client.CachedSession")
+    def test_list_repositories_fetches_remaining_pages_from_link(
+        self, mock_session_class: Mock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Pages 2..last named by the Link header are fetched and merged in order."""
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+        mock_session = MagicMock()
+        mock_session_class.return_value = mock_session
+
+        def fake_get(url: str, params: Any = None, **kwargs: Any) -> Mock:
+            page = params["page"]
+            response = Mock()
+            response.status_code = 200
+            response.from_cache = False
+            response.headers = {}
+            if page == 1:
+                response.headers = {
+                    "Link": '<https://api.github.com/orgs/TestOrg/repos?page=2>; rel="next", '
+                    '<https://api.github.com/orgs/TestOrg/repos?page=3>; rel="last"'
+                }
+            response.json.return_value = [{"name": f"ds00000{page}"}]
+            return response
+
+        mock_session.get.side_effect = fake_get
+
+        client = GitHubClient()
+        repos = client.list_repositories("TestOrg")
+
+        assert [r["name"] for r in repos] == ["ds000001", "ds000002", "ds000003"]
+        assert mock_session.get.call_count == 3
+
+    @patch("openneuro_studies.utils.github_client.CachedSession")
+    def test_list_repositories_graphql(self, mock_session_class: Mock) -> None:
+        """With a token, the listing pages through GraphQL and returns REST-shaped dicts."""
+        mock_session = MagicMock()
+        mock_session_class.return_value = mock_session
+
+        def page(nodes: Any, has_next: bool, cursor: Any) -> Mock:
+            response = Mock()
+            response.json.return_value = {
+                "data": {
+                    "organization": {
+                        "repositories": {
+                            "nodes": nodes,
+                            "pageInfo": {"hasNextPage": has_next, "endCursor": cursor},
+                        }
+                    }
+                }
+            }
+            return response
+
+        mock_session.post.side_effect = [
+            page(
+                [
+                    {
+                        "name": "ds000001",
+                        "url": "https://github.com/TestOrg/ds000001",
+                        "defaultBranchRef": {"name": "main", "target": {"oid": "a" * 40}},
+                    }
+                ],
+                True,
+                "c1",
+            ),
+            page(
+                [{"name": "ds000002", "url": "https://github.com/TestOrg/ds000002"}],
+                False,
+                None,
+            ),
+        ]
+
+        client = GitHubClient(token="test_token")
+        repos = client.list_repositories("TestOrg")
+
+        assert repos == [
+            {
+                "name": "ds000001",
+                "clone_url": "https://github.com/TestOrg/ds000001.git",
+                "default_branch": "main",
+                "default_branch_sha": "a" * 40,
+            },
+            {
+                "name": "ds000002",
+                "clone_url": "https://github.com/TestOrg/ds000002.git",
+                "default_branch": "main",
+                "default_branch_sha": None,
+            },
+        ]
+        assert mock_session.post.call_args.kwargs["json"]["variables"]["cursor"] == "c1"
+        mock_session.get.assert_not_called()
+
+        # A second listing in the same run (e.g. discover --progress) is not re-fetched
+        assert client.list_repositories("TestOrg") == repos
+        assert mock_session.post.call_count == 2
+
+    @patch("openneuro_studies.utils.github_client.CachedSession")
+    def test_list_repositories_graphql_filter_uses_aliases(self, mock_session_class: Mock) -> None:
+        """Filtered lookups go out as one aliased query; missing repositories are skipped."""
+        mock_session = MagicMock()
+        mock_session_class.return_value = mock_session
+
+        response = Mock()
+        response.json.return_value = {
+            "data": {
+                "r0": {"name": "ds000001", "url": "https://github.com/TestOrg/ds000001"},
+                "r1": None,
+            },
+            "errors": [{"type": "NOT_FOUND", "path": ["r1"]}],
+        }
+        mock_session.post.return_value = response
+
+        client = GitHubClient(token="test_token")
+        repos = client.list_repositories("TestOrg", dataset_filter=["ds000001", "ds999999"])
+
+        assert [r["name"] for r in repos] == ["ds000001"]
+        assert mock_session.post.call_count == 1
+        payload = mock_session.post.call_args.kwargs["json"]
+        assert "r1: repository(owner: $o1, name: $n1)" in payload["query"]
+        assert payload["variables"] == {
+            "o0": "TestOrg",
+            "n0": "ds000001",
+            "o1": "TestOrg",
+            "n1": "ds999999",
+        }
+
     @patch("openneuro_studies.utils.github_client.CachedSession")
     def test_get_file_content(self, mock_session_class: Mock) -> None:
         """Test getting file content from repository."""
@@ -86,42 +218,93 @@ class TestGitHubClient:
         mock_session_class.return_value = mock_session
 
         test_content = "test file content"
-        encoded_content = base64.b64encode(test_content.encode()).decode()
 
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"content": encoded_content}
+        mock_response.content = test_content.encode()
         mock_session.get.return_value = mock_response
 
         client = GitHubClient(token="test_token")
         content = client.get_file_content("owner", "repo", "path/to/file.txt")
 
         assert content == test_content
+        # Raw media type: file bytes directly, no JSON envelope or base64
+        assert mock_session.get.call_args.kwargs["headers"] == {
+            "Accept": "application/vnd.github.raw"
+        }
+        assert mock_session.get.call_args.kwargs["params"] == {"ref": "HEAD"}
+
+    @patch("openneuro_studies.utils.github_client.CachedSession")
+    def test_get_file_content_at_commit_is_memoized(self, mock_session_class: Mock) -> None:
+        """Test that content pinned to a commit SHA is fetched once; branch refs are not."""
+        mock_session = MagicMock()
+        mock_session_class.return_value = mock_session
+
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = b"{}"
+        mock_session.get.return_value = mock_response
+
+        client = GitHubClient(token="test_token")
+        for _ in range(2):
+            assert client.get_file_content("owner", "repo", "f.json", ref="a" * 40) == "{}"
+        assert mock_session.get.call_count == 1
+
+        for _ in range(2):
+            client.get_file_content("owner", "repo", "f.json", ref="main")
+        assert mock_session.get.call_count == 3
 
     @patch("openneuro_studies.utils.github_client.CachedSession")
-    def test_get_file_content_missing_field(self, mock_session_class: Mock) -> None:
-        """Test error when content field is missing."""
+    def test_get_file_content_not_utf8(self, mock_session_class: Mock) -> None:
+        """Test error when the raw file is not UTF-8 text."""
         # Setup mock
         mock_session = MagicMock()
         mock_session_class.return_value = mock_session
 
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"not_content": "data"}
+        mock_response.content = b"\xff\xfe binary"
         mock_session.get.return_value = mock_response
 
         client = GitHubClient(token="test_token")
 
-        with pytest.raises(GitHubAPIError, match="no content field"):
+        with pytest.raises(GitHubAPIError, match="not UTF-8"):
             client.get_file_content("owner", "repo", "path/to/file.txt")
 
     @patch("openneuro_studies.utils.github_client.CachedSession")
     def test_get_default_branch_sha(self, mock_session_class: Mock) -> None:
-        """Test getting commit SHA of default branch."""
+        """Test getting commit SHA of default branch via cached REST, even with a token."""
         # Setup mock
         mock_session = MagicMock()
         mock_session_class.return_value = mock_session
 
+        # Mock commit info for HEAD
+        commit_response = Mock()
+        commit_response.status_code = 200
+        commit_response.json.return_value = {"sha": "a" * 40}
+
+        mock_session.get.return_value = commit_response
+
+        client = GitHubClient(token="test_token")
+        sha = client.get_default_branch_sha("owner", "repo")
+
+        assert sha == "a" * 40
+        mock_session.post.assert_not_called()
+        assert mock_session.get.call_count == 1
+        assert mock_session.get.call_args.args[0].endswith("/repos/owner/repo/commits/HEAD")
+
+    @patch("openneuro_studies.utils.github_client.CachedSession")
+    def test_get_default_branch_sha_falls_back_to_branches(self, mock_session_class: Mock) -> None:
+        """Test falling back to repo info and branch lookup when HEAD fails."""
+        import requests
+
+        mock_session = MagicMock()
+        mock_session_class.return_value = mock_session
+
+        head_response = Mock()
+        head_response.status_code = 409
+        head_response.raise_for_status.side_effect = requests.exceptions.HTTPError("409")
+
         # Mock repository info
         repo_response = Mock()
         repo_response.status_code = 200
@@ -132,13 +315,47 @@ class TestGitHubClient:
         commit_response.status_code = 200
         commit_response.json.return_value = {"sha": "a" * 40}
 
-        mock_session.get.side_effect = [repo_response, commit_response]
+        mock_session.get.side_effect = [head_response, repo_response, commit_response]
 
         client = GitHubClient(token="test_token")
         sha = client.get_default_branch_sha("owner", "repo")
 
         assert sha == "a" * 40
-        assert mock_session.get.call_count == 2
+        assert mock_session.get.call_count == 3
+
+    @patch("openneuro_studies.utils.github_client.CachedSession")
+    def test_get_default_branch_shas_batches_aliases(self, mock_session_class: Mock) -> None:
+        """Many repositories resolve in one aliased query per 50; unknown ones are omitted."""
+        mock_session = MagicMock()
+        mock_session_class.return_value = mock_session
+
+        def fake_post(url: str, json: Any = None, timeout: Any = None) -> Mock:
+            count = len(json["variables"]) // 2
+            data = {
+                f"r{i}": {
+                    "name": json["variables"][f"n{i}"],
+                    "url": "u",
+                    "defaultBranchRef": {"name": "main", "target": {"oid": f"{i:040d}"}},
+                }
+                for i in range(count)
+            }
+            data["r1"] = None
+            response = Mock()
+            response.json.return_value = {"data": data}
+            return response
+
+        mock_session.post.side_effect = fake_post
+
+        client = GitHubClient(token="test_token")
+        repos = [("org", f"ds{i:06d}") for i in range(60)]
+        shas = client.get_default_branch_shas(repos)
+
+        assert mock_session.post.call_count == 2
+        assert ("org", "ds000001") not in shas
+        assert ("org", "ds000051") not in shas
+        assert shas[("org", "ds000000")] == f"{0:040d}"
+        assert shas[("org", "ds000059")] == f"{9:040d}"
+        assert len(shas) == 58
 
     @patch("openneuro_studies.utils.github_client.CachedSession")
     @patch("time.sleep")  # Mock sleep to prevent actual waiting
@@ -200,3 +417,175 @@ class TestGitHubClient:
         assert result == {"data": "success"}
         assert mock_session.get.call_count == 2
         assert mock_sleep.called  # Verify exponential backoff was used
+        assert 0 <= mock_sleep.call_args.args[0] <= 1  # Jittered within 2**attempt
+
+    @patch("openneuro_studies.utils.github_client.CachedSession")
+    def test_graphql(self, mock_session_class: Mock) -> None:
+        """Test GraphQL query returns data and raises on reported errors."""
+        mock_session = MagicMock()
+        mock_session_class.return_value = mock_session
+
+        mock_response = Mock()
+        mock_response.json.return_value = {"data": {"organization": {"login": "TestOrg"}}}
+        mock_session.post.return_value = mock_response
+
+        client = GitHubClient(token="test_token")
+        data = client.graphql("query($org: String!) { ... }", {"org": "TestOrg"})
+
+        assert data == {"organization": {"login": "TestOrg"}}
+        assert mock_session.post.call_args.args[0] == "https://api.github.com/graphql"
+        assert mock_session.post.call_args.kwargs["json"]["variables"] == {"org": "TestOrg"}
+
+        mock_response.json.return_value = {"data": None, "errors": [{"message": "Bad query"}]}
+        with pytest.raises(GitHubAPIError, match="Bad query"):
+            client.graphql("query { bad }")
+
+    @patch("openneuro_studies.utils.github_client.CachedSession")
+    @patch("time.sleep")
+    def test_retry_after_on_secondary_rate_limit(
+        self, mock_sleep: Mock, mock_session_class: Mock
+    ) -> None:
+        """Test that a Retry-After header is honored before retrying."""
+        mock_session = MagicMock()
+        mock_session_class.return_value = mock_session
+
+        limited_response = Mock()
+        limited_response.status_code = 429
+        limited_response.headers = {"Retry-After": "3"}
+
+        success_response = Mock()
+        success_response.status_code = 200
+        success_response.from_cache = True
+        success_response.json.return_value = {"data": "success"}
+
+        mock_session.get.side_effect = [limited_response, success_response]
+
+        client = GitHubClient(token="test_token")
+        assert client._request("/test/endpoint") == {"data": "success"}
+        assert mock_session.get.call_count == 2
+        waited = mock_sleep.call_args.args[0]
+        assert 3 <= waited <= 4
+
+    @patch("openneuro_studies.utils.github_client.CachedSession")
+    @patch("time.sleep")
+    @patch("time.time", return_value=100)
+    def test_paces_when_rate_limit_nearly_exhausted(
+        self, mock_time: Mock, mock_sleep: Mock, mock_session_class: Mock, monkeypatch: Any
+    ) -> None:
+        """Test proactive pacing when few requests remain before reset."""
+        monkeypatch.setattr(github_client, "_paced_until", 0.0)
+        mock_session = MagicMock()
+        mock_session_class.return_value = mock_session
+
+        response = Mock()
+        response.status_code = 200
+        response.from_cache = False
+        response.headers = {"X-RateLimit-Remaining": "2", "X-RateLimit-Reset": "160"}
+        response.json.return_value = {"data": "success"}
+        mock_session.get.return_value = response
+
+        client = GitHubClient(token="test_token")
+        client._request("/test/endpoint")
+        mock_sleep.assert_called_once_with(30.0)
+
+        # Plenty of budget left: no pause
+        mock_sleep.reset_mock()
+        response.headers = {"X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": "160"}
+        client._request("/test/endpoint")
+        mock_sleep.assert_not_called()
+
+    @patch("time.sleep")
+    @patch("time.monotonic", return_value=1000.0)
+    @patch("time.time", return_value=100)
+    def test_pacing_slots_are_capped_and_slept_unlocked(
+        self, mock_time: Mock, mock_monotonic: Mock, mock_sleep: Mock, monkeypatch: Any
+    ) -> None:
+        """Test that concurrent pauses take successive capped slots outside the lock."""
+        monkeypatch.setattr(github_client, "_paced_until", 0.0)
+        mock_sleep.side_effect = lambda _: (
+            pytest.fail("slept holding the rate limit lock")
+            if github_client._rate_limit_lock.locked()
+            else None
+        )
+
+        response = Mock()
+        response.from_cache = False
+        response.headers = {"X-RateLimit-Remaining": "2", "X-RateLimit-Reset": "160"}
+        GitHubClient._pace_rate_limit(response)
+        GitHubClient._pace_rate_limit(response)  # Slot after the first pause
+        GitHubClient._pace_rate_limit(response)  # Would be 90s away: capped
+
+        cap = github_client._RATE_LIMIT_MAX_PAUSE
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [30.0, cap, cap]
+
+        # A whole reset window is never slept in one go
+        mock_sleep.reset_mock()
+        monkeypatch.setattr(github_client, "_paced_until", 0.0)
+        response.headers = {"X-RateLimit-Remaining": "1", "X-RateLimit-Reset": "3700"}
+        GitHubClient._pace_rate_limit(response)
+        mock_sleep.assert_called_once_with(cap)
+
+    def test_cache_uses_write_ahead_log(self, tmp_path: Any) -> None:
+        """Test that the SQLite response cache is opened in WAL mode."""
+        client = GitHubClient(token="test_token", cache_dir=str(tmp_path))
+        with client.session.cache.responses.connection() as connection:
+            journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+        assert journal_mode == "wal"
+
+    def test_expired_cache_entry_revalidates_with_etag(self, tmp_path: Any) -> None:
+        """Test that an expired entry is revalidated with If-None-Match and a 304 reuses it."""
+
+        class ETagAdapter(HTTPAdapter):
+            def __init__(self) -> None:
+                super().__init__()
+                self.if_none_match: list = []
+
+            def send(self, request: Any, **kwargs: Any) -> Any:
+                self.if_none_match.append(request.headers.get("If-None-Match"))
+                not_modified = request.headers.get("If-None-Match") == '"v1"'
+                raw = HTTPResponse(
+                    body=io.BytesIO(b"" if not_modified else b'{"name": "ds000001"}'),
+                    status=304 if not_modified else 200,
+                    headers={"ETag": '"v1"', "Content-Type": "application/json"},
+                    preload_content=False,
+                )
+                return self.build_response(request, raw)
+
+        client = GitHubClient(token="test_token", cache_dir=str(tmp_path), cache_expire_after=0)
+        adapter = ETagAdapter()
+        client.session.mount("https://", adapter)
+
+        assert client._request("/repos/org/ds000001") == {"name": "ds000001"}
+        assert client._request("/repos/org/ds000001") == {"name": "ds000001"}
+        assert adapter.if_none_match == [None, '"v1"']
+
+    @patch("openneuro_studies.utils.github_client.CachedSession")
+    @patch("time.sleep")
+    def test_client_error_not_retried(self, mock_sleep: Mock, mock_session_class: Mock) -> None:
+        """Test that a 404 fails at once instead of being retried with backoff."""
+        import requests
+
+        mock_session = MagicMock()
+        mock_session_class.return_value = mock_session
+
+        not_found = Mock()
+        not_found.status_code = 404
+        not_found.raise_for_status.side_effect = requests.exceptions.HTTPError("404 Not Found")
+        mock_session.get.return_value = not_found
+
+        client = GitHubClient(token="test_token")
+        with pytest.raises(GitHubAPIError, match="404"):
+            client._request("/repos/org/missing")
+
+        assert mock_session.get.call_count == 1
+        mock_sleep.assert_not_called()
+
+    def test_transport_retries_server_errors(self, tmp_path: Any) -> None:
+        """Test that the pooled adapter retries 5xx and connection errors, not rate limits."""
+        client = GitHubClient(token="test_token", cache_dir=str(tmp_path))
+        retries = client.session.get_adapter("https://api.github.com").max_retries
+
+        assert retries.total == 3
+        assert set(retries.status_forcelist) == {500, 502, 503, 504}
+        assert "POST" in retries.allowed_methods
+        assert not retries.respect_retry_after_header
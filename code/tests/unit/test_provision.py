@@ -10,7 +10,9 @@ from openneuro_studies.provision import (
     TEMPLATE_VERSION_DIR,
     TEMPLATE_VERSION_FILE,
     needs_provisioning,
+    provision_studies,
     provision_study,
+    provisioner,
 )
 from openneuro_studies.provision.provisioner import (
     TEMPLATE_VERSION,
@@ -132,6 +134,33 @@ class TestProvisionStudy:
         assert "report.json" in content
         assert "report.txt" in content
 
+    def test_reprovision_keeps_script_executable(self, tmp_path: Path):
+        """Forced re-provisioning should leave the validator script executable."""
+        import stat
+
+        study_path = tmp_path / "study-ds000001"
+        study_path.mkdir()
+        provision_study(study_path)
+
+        result = provision_study(study_path, force=True)
+
+        assert result.provisioned is True
+        mode = (study_path / "code" / "run-bids-validator").stat().st_mode
+        assert mode & stat.S_IXUSR
+
+    def test_reprovision_skips_chmod_when_executable(self, tmp_path: Path, monkeypatch):
+        """Re-provisioning should not chmod a script that is already executable."""
+        study_path = tmp_path / "study-ds000001"
+        study_path.mkdir()
+        provision_study(study_path)
+
+        chmod_calls = []
+        monkeypatch.setattr(os, "chmod", lambda path, mode, **kwargs: chmod_calls.append(path))
+        result = provision_study(study_path, force=True)
+
+        assert result.provisioned is True
+        assert chmod_calls == []
+
     def test_provision_creates_readme(self, tmp_path: Path):
         """Provisioning should create README with study info."""
         study_path = tmp_path / "study-ds000001"
@@ -226,6 +255,155 @@ class TestProvisionStudy:
         assert not (study_path / "README.md").exists()
         assert not (study_path / TEMPLATE_VERSION_FILE).exists()
 
+    def test_provision_dry_run_reports_updates(self, tmp_path: Path):
+        """Dry run should report existing templated files as updates."""
+        study_path = tmp_path / "study-ds000001"
+        study_path.mkdir()
+        (study_path / "README.md").write_text("Old README")
+        version_dir = study_path / TEMPLATE_VERSION_DIR
+        version_dir.mkdir()
+        (study_path / TEMPLATE_VERSION_FILE).write_text("0.9.0\n")
+
+        result = provision_study(study_path, dry_run=True)
+
+        assert result.files_created == ["code/run-bids-validator"]
+        assert sorted(result.files_updated) == sorted(["README.md", TEMPLATE_VERSION_FILE])
+
+
+class TestCopierCommand:
+    """Tests for copier command resolution."""
+
+    def test_copier_cmd_resolved_once(self, monkeypatch):
+        """PATH lookup for copier should happen once per process."""
+        calls = []
+
+        def fake_which(name):
+            calls.append(name)
+            return "/opt/bin/copier"
+
+        provisioner._resolve_copier.cache_clear()
+        monkeypatch.setattr(provisioner.shutil, "which", fake_which)
+        try:
+            first = provisioner._resolve_copier()
+            second = provisioner._resolve_copier()
+        finally:
+            provisioner._resolve_copier.cache_clear()
+
+        assert first == second == ("/opt/bin/copier",)
+        assert calls == ["copier"]
+
+    def test_copier_cmd_unavailable(self, monkeypatch):
+        """Should return None when copier is neither on PATH nor importable."""
+        provisioner._resolve_copier.cache_clear()
+        monkeypatch.setattr(provisioner.shutil, "which", lambda name: None)
+        monkeypatch.setattr(provisioner.sys, "executable", "/nonexistent/python")
+        try:
+            assert provisioner._resolve_copier() is None
+        finally:
+            provisioner._resolve_copier.cache_clear()
+
+    def test_subprocess_fallback_without_copier_package(self, tmp_path: Path, monkeypatch):
+        """Provisioning should fall back to the copier CLI if the API is unavailable."""
+        study_path = tmp_path / "study-ds000001"
+        study_path.mkdir()
+        monkeypatch.setattr(provisioner, "COPIER_AVAILABLE", False)
+
+        result = provision_study(study_path)
+
+        assert result.provisioned is True
+        assert result.error is None
+        assert get_template_version(study_path) == TEMPLATE_VERSION
+
+
+class TestProvisionStudies:
+    """Tests for provision_studies batch function."""
+
+    def test_provision_studies_parallel(self, tmp_path: Path):
+        """Parallel provisioning should provision all studies, preserving order."""
+        study_paths = []
+        for ds in ("ds000001", "ds000002", "ds000003"):
+            study_path = tmp_path / f"study-{ds}"
+            study_path.mkdir()
+            study_paths.append(study_path)
+
+        results = provision_studies(study_paths, workers=3)
+
+        assert [r.study_id for r in results] == [p.name for p in study_paths]
+        assert all(r.provisioned and r.error is None for r in results)
+        for study_path in study_paths:
+            assert get_template_version(study_path) == TEMPLATE_VERSION
+
+    def test_provision_studies_parallel_relative_paths(self, tmp_path: Path, monkeypatch):
+        """Parallel provisioning of relative paths should not race on the working directory."""
+        monkeypatch.chdir(tmp_path)
+        study_paths = []
+        for i in range(1, 9):
+            study_path = Path(f"study-ds{i:06d}")
+            study_path.mkdir()
+            study_paths.append(study_path)
+
+        results = provision_studies(study_paths, workers=4)
+
+        assert [r.error for r in results] == [None] * len(study_paths)
+        assert os.getcwd() == str(tmp_path)
+        for study_path in study_paths:
+            assert get_template_version(tmp_path / study_path) == TEMPLATE_VERSION
+        assert sorted(p.name for p in tmp_path.iterdir()) == sorted(p.name for p in study_paths)
+
+    def test_provision_studies_parallel_uses_copier_subprocess(self, tmp_path: Path, monkeypatch):
+        """Parallel provisioning should not run copier in-process (it changes the cwd)."""
+        study_paths = []
+        for ds in ("ds000001", "ds000002", "ds000003"):
+            study_path = tmp_path / f"study-{ds}"
+            study_path.mkdir()
+            study_paths.append(study_path)
+
+        def fail_run_copy(*args, **kwargs):
+            raise AssertionError("copier.run_copy called from a worker thread")
+
+        monkeypatch.setattr(provisioner.copier, "run_copy", fail_run_copy)
+        results = provision_studies(study_paths, workers=3)
+
+        assert [r.error for r in results] == [None, None, None]
+        for study_path in study_paths:
+            assert get_template_version(study_path) == TEMPLATE_VERSION
+
+    def test_provision_studies_resolves_copier_once(self, tmp_path: Path, monkeypatch):
+        """CLI fallback should resolve copier once for the whole batch."""
+        study_paths = []
+        for ds in ("ds000001", "ds000002", "ds000003", "ds000004"):
+            study_path = tmp_path / f"study-{ds}"
+            study_path.mkdir()
+            study_paths.append(study_path)
+
+        calls = []
+        real_which = provisioner.shutil.which
+
+        def counting_which(name):
+            calls.append(name)
+            return real_which(name)
+
+        provisioner._resolve_copier.cache_clear()
+        monkeypatch.setattr(provisioner, "COPIER_AVAILABLE", False)
+        monkeypatch.setattr(provisioner.shutil, "which", counting_which)
+        try:
+            results = provision_studies(study_paths, workers=4)
+        finally:
+            provisioner._resolve_copier.cache_clear()
+
+        assert all(r.provisioned for r in results)
+        assert calls == ["copier"]
+
+    def test_provision_studies_dry_run(self, tmp_path: Path):
+        """Batch dry run should not create files."""
+        study_path = tmp_path / "study-ds000001"
+        study_path.mkdir()
+
+        results = provision_studies([study_path], dry_run=True, workers=2)
+
+        assert results[0].provisioned is True
+        assert not (study_path / "README.md").exists()
+
 
 class TestValidatorScriptContent:
     """Tests for the generated validator script content."""
@@ -329,6 +507,7 @@ class TestProvisionCLI:
         assert "--dry-run" in result.output
         assert "--commit" in result.output
         assert "--when" in result.output
+        assert "--workers" in result.output
         assert "STUDY_IDS" in result.output
 
     def test_provision_no_studies(self, tmp_path: Path):
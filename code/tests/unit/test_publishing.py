@@ -16,6 +16,7 @@ from openneuro_studies.publishing import (
     save_publication_status,
 )
 from openneuro_studies.publishing.sync import SyncResult, sync_publication_status
+from openneuro_studies.utils import GitHubAPIError
 
 
 class TestPublishedStudy:
@@ -211,6 +212,23 @@ class TestPublicationTracker:
         assert "study-ds000001" in studies
         assert "study-ds000002" in studies
 
+    @pytest.mark.ai_generated
+    def test_context_manager_saves_once_when_dirty(self, tmp_path):
+        """Test that the tracker saves once on exit, and only after changes."""
+        with patch.object(PublicationTracker, "save") as mock_save:
+            with PublicationTracker(tmp_path):
+                pass
+            mock_save.assert_not_called()
+
+            with PublicationTracker(tmp_path) as tracker:
+                tracker.mark_published(
+                    "study-ds000001", "https://github.com/TestOrg/study-ds000001", "a" * 40
+                )
+                tracker.mark_published(
+                    "study-ds000002", "https://github.com/TestOrg/study-ds000002", "b" * 40
+                )
+            mock_save.assert_called_once_with(commit=True)
+
 
 class TestLoadSavePublicationStatus:
     """Test load/save publication status functions."""
@@ -240,22 +258,88 @@ class TestLoadSavePublicationStatus:
         assert loaded_status.studies[0].study_id == "study-ds000001"
         assert loaded_status.organization == "TestOrg"
 
+    @pytest.mark.ai_generated
+    def test_load_returns_independent_copies(self, tmp_path):
+        """Test that loads are not shared and saves are picked up."""
+        status = PublicationStatus(
+            studies=[], organization="TestOrg", last_updated=datetime.utcnow()
+        )
+        save_publication_status(status, tmp_path, commit=False)
+
+        first = load_publication_status(tmp_path)
+        first.organization = "Mutated"
+        assert load_publication_status(tmp_path).organization == "TestOrg"
+
+        status.organization = "OtherOrg"
+        save_publication_status(status, tmp_path, commit=False)
+        assert load_publication_status(tmp_path).organization == "OtherOrg"
+
+    @pytest.mark.ai_generated
+    def test_save_writes_utf8(self, tmp_path):
+        """Test that non-ASCII text is written as UTF-8 and loads back unchanged."""
+        status = PublicationStatus(
+            studies=[], organization="Études", last_updated=datetime.utcnow()
+        )
+        save_publication_status(status, tmp_path, commit=False)
+
+        raw = (tmp_path / "published-studies.json").read_bytes()
+        assert "Études".encode("utf-8") in raw
+        assert load_publication_status(tmp_path).organization == "Études"
+
+    @pytest.mark.ai_generated
+    def test_save_commits_by_default(self, tmp_path, monkeypatch):
+        """Test that saving commits unless deferred, and the tracker commits once."""
+        from openneuro_studies.publishing import status_tracker
+
+        saves = []
+        monkeypatch.setattr(status_tracker.dl, "save", lambda **kwargs: saves.append(kwargs))
+        status = PublicationStatus(
+            studies=[], organization="TestOrg", last_updated=datetime.utcnow()
+        )
+
+        save_publication_status(status, tmp_path, commit=False)
+        assert (tmp_path / "published-studies.json").exists()
+        assert saves == []
+
+        save_publication_status(status, tmp_path)
+        assert len(saves) == 1
+
+        tracker = PublicationTracker(tmp_path)
+        tracker.flush()
+        assert len(saves) == 1
+
+        tracker.mark_published(
+            "study-ds000001", "https://github.com/TestOrg/study-ds000001", "a" * 40
+        )
+        tracker.flush()
+        tracker.flush()
+        assert len(saves) == 2
+
 
 class TestGitHubPublisher:
     """Test GitHubPublisher class."""
 
     @pytest.mark.ai_generated
-    def test_init_invalid_organization(self):
-        """Test initialization with invalid organization."""
+    def test_init_sends_no_request(self):
+        """Test that constructing the publisher does not contact GitHub."""
+        with patch("github.Requester.Requester.requestJsonAndCheck") as mock_request:
+            publisher = GitHubPublisher("fake-token", "TestOrg")
+        mock_request.assert_not_called()
+        assert publisher.organization.login == "TestOrg"
+
+    @pytest.mark.ai_generated
+    def test_prime_repo_cache_invalid_organization(self):
+        """Test that an inaccessible organization is reported on first use."""
         with patch("openneuro_studies.publishing.github_publisher.Github") as mock_github:
             mock_github_instance = Mock()
             mock_github.return_value = mock_github_instance
-            mock_github_instance.get_organization.side_effect = UnknownObjectException(
-                status=404, data={"message": "Not Found"}, headers={}
+            mock_github_instance.get_organization.return_value.get_repos.side_effect = (
+                UnknownObjectException(status=404, data={"message": "Not Found"}, headers={})
             )
+            publisher = GitHubPublisher("fake-token", "NonexistentOrg")
 
             with pytest.raises(PublishError, match="not found"):
-                GitHubPublisher("fake-token", "NonexistentOrg")
+                publisher.prime_repo_cache()
 
     @pytest.mark.ai_generated
     def test_repository_exists(self):
@@ -280,6 +364,29 @@ class TestGitHubPublisher:
     @pytest.mark.ai_generated
     def test_get_remote_head_sha(self):
         """Test getting remote HEAD commit SHA."""
+        with (
+            patch("openneuro_studies.publishing.github_publisher.Github"),
+            patch("openneuro_studies.publishing.github_publisher.GitHubClient") as mock_client,
+        ):
+            mock_client.return_value.get_default_branch_sha.return_value = "a" * 40
+
+            publisher = GitHubPublisher("fake-token", "TestOrg")
+            sha = publisher.get_remote_head_sha("study-ds000001")
+            assert sha == "a" * 40
+            mock_client.assert_called_once_with(token="fake-token", always_revalidate=True)
+            mock_client.return_value.get_default_branch_sha.assert_called_once_with(
+                "TestOrg", "study-ds000001"
+            )
+
+            # Missing or empty repository
+            mock_client.return_value.get_default_branch_sha.side_effect = GitHubAPIError(
+                "Could not get commit SHA"
+            )
+            assert publisher.get_remote_head_sha("study-ds000001") is None
+
+    @pytest.mark.ai_generated
+    def test_prime_repo_cache(self):
+        """Test that a primed cache answers lookups without per-repo requests."""
         with patch("openneuro_studies.publishing.github_publisher.Github") as mock_github:
             mock_github_instance = Mock()
             mock_github.return_value = mock_github_instance
@@ -287,42 +394,192 @@ class TestGitHubPublisher:
             mock_github_instance.get_organization.return_value = mock_org
 
             mock_repo = Mock()
-            mock_repo.default_branch = "main"
-            mock_branch = Mock()
-            mock_commit = Mock()
-            mock_commit.sha = "a" * 40
-            mock_branch.commit = mock_commit
-            mock_repo.get_branch.return_value = mock_branch
-            mock_org.get_repo.return_value = mock_repo
+            mock_repo.name = "study-ds000001"
+            mock_org.get_repos.return_value = [mock_repo]
 
             publisher = GitHubPublisher("fake-token", "TestOrg")
-            sha = publisher.get_remote_head_sha("study-ds000001")
+            publisher.prime_repo_cache()
+
+            assert publisher.repository_exists("study-ds000001") is True
+            assert publisher.repository_exists("study-ds999999") is False
+            assert publisher.get_remote_head_sha("study-ds999999") is None
+            mock_org.get_repo.assert_not_called()
+
+            # Newly created repositories are added to the cache
+            new_repo = Mock()
+            mock_org.create_repo.return_value = new_repo
+            publisher.create_repository("study-ds000002")
+            assert publisher.repository_exists("study-ds000002") is True
+
+    @pytest.mark.ai_generated
+    def test_git_probe(self, tmp_path):
+        """Test reading HEAD, branch and origin of a local repository."""
+        import subprocess
+
+        from openneuro_studies.publishing.github_publisher import _git_probe
+
+        def git(*args):
+            subprocess.run(["git", "-C", str(tmp_path), *args], check=True, capture_output=True)
+
+        git("init", "-b", "main")
+        git("commit", "--allow-empty", "-m", "init")
+
+        head_sha, branch, origin_url = _git_probe(tmp_path)
+        assert len(head_sha) == 40
+        assert branch == "main"
+        assert origin_url is None
+
+        git("remote", "add", "origin", "https://github.com/TestOrg/study-ds000001.git")
+        assert _git_probe(tmp_path) == (
+            head_sha,
+            "main",
+            "https://github.com/TestOrg/study-ds000001.git",
+        )
+
+    @pytest.mark.ai_generated
+    def test_pygit2_probe_matches_git(self, tmp_path):
+        """Test that the libgit2 probe agrees with the git subprocess probe."""
+        pytest.importorskip("pygit2")
+        import subprocess
+
+        from openneuro_studies.publishing import github_publisher
+
+        def git(*args):
+            subprocess.run(["git", "-C", str(tmp_path), *args], check=True, capture_output=True)
+
+        git("init", "-b", "main")
+        git("commit", "--allow-empty", "-m", "init")
+        git("remote", "add", "origin", "https://github.com/TestOrg/study-ds000001.git")
+
+        in_process = github_publisher._pygit2_probe(tmp_path)
+        with patch.object(github_publisher, "PYGIT2_AVAILABLE", False):
+            assert in_process == github_publisher._git_probe(tmp_path)
+
+    @pytest.mark.ai_generated
+    def test_publish_study_skips_push_when_remote_matches(self, tmp_path):
+        """Test that even a forced publish does not push an up-to-date study."""
+        with patch("openneuro_studies.publishing.github_publisher.Github"):
+            publisher = GitHubPublisher("fake-token", "TestOrg")
+
+        with (
+            patch.object(publisher, "repository_exists", return_value=True),
+            patch.object(publisher, "get_remote_head_sha", return_value="a" * 40),
+            patch.object(publisher, "push_to_github") as mock_push,
+        ):
+            _url, sha, was_created = publisher.publish_study(
+                tmp_path / "study-ds000001", force=True, local_sha="a" * 40
+            )
             assert sha == "a" * 40
+            assert was_created is False
+            mock_push.assert_not_called()
+
+            # Diverged remote: forced push leases on the remote SHA it saw
+            publisher.publish_study(tmp_path / "study-ds000001", force=True, local_sha="b" * 40)
+            assert mock_push.call_args.kwargs == {"force": True, "expected_remote_sha": "a" * 40}
+
+    @pytest.mark.ai_generated
+    def test_push_failure_reports_git_stderr(self, tmp_path):
+        """Test that a failed push surfaces git's stderr in the error."""
+        import subprocess
+
+        def git(*args):
+            subprocess.run(["git", "-C", str(tmp_path), *args], check=True, capture_output=True)
+
+        git("init", "-b", "main")
+        git("commit", "--allow-empty", "-m", "init")
+
+        with patch("openneuro_studies.publishing.github_publisher.Github"):
+            publisher = GitHubPublisher("fake-token", "TestOrg")
+
+        missing_remote = str(tmp_path / "does-not-exist.git")
+        with pytest.raises(PublishError, match="does-not-exist"):
+            publisher.push_to_github(tmp_path, missing_remote)
+
+    @pytest.mark.ai_generated
+    def test_forced_push_leases_on_pushed_branch(self, tmp_path):
+        """Test that the lease is taken on the pushed branch, not the remote default."""
+        import subprocess
+
+        def git(path, *args):
+            return subprocess.run(
+                ["git", "-C", str(path), *args], check=True, capture_output=True, text=True
+            ).stdout.strip()
+
+        remote = tmp_path / "remote.git"
+        subprocess.run(["git", "init", "--bare", "-b", "main", str(remote)], check=True)
+        seed = tmp_path / "seed"
+        git(tmp_path, "init", "-b", "main", str(seed))
+        git(seed, "commit", "--allow-empty", "-m", "main")
+        git(seed, "push", str(remote), "main", "main:master")
+        git(seed, "commit", "--allow-empty", "-m", "main moved")
+        git(seed, "push", str(remote), "main")
+        main_sha = git(seed, "rev-parse", "HEAD")
+
+        local = tmp_path / "study-ds000001"
+        git(tmp_path, "init", "-b", "master", str(local))
+        git(local, "commit", "--allow-empty", "-m", "diverged")
+
+        with patch("openneuro_studies.publishing.github_publisher.Github"):
+            publisher = GitHubPublisher("fake-token", "TestOrg")
+
+        # master is not the remote default: its own tip is the lease, and the push lands
+        sha = publisher.push_to_github(local, str(remote), force=True, expected_remote_sha=main_sha)
+        assert git(remote, "rev-parse", "master") == sha
+
+        # main is the default: a remote that moved past the SHA the caller saw is kept
+        git(local, "checkout", "-b", "main")
+        with pytest.raises(PublishError, match="stale info"):
+            publisher.push_to_github(local, str(remote), force=True, expected_remote_sha="a" * 40)
+        assert git(remote, "rev-parse", "main") == main_sha
+
+    @pytest.mark.ai_generated
+    def test_push_config_args(self, monkeypatch):
+        """Test git -c push settings default and environment override."""
+        from openneuro_studies.publishing.github_publisher import _push_config_args
+
+        monkeypatch.delenv("OPENNEURO_STUDIES_PUSH_GIT_CONFIG", raising=False)
+        assert _push_config_args() == ["-c", "pack.threads=0", "-c", "pack.useSparse=true"]
+
+        monkeypatch.setenv("OPENNEURO_STUDIES_PUSH_GIT_CONFIG", "pack.threads=4")
+        assert _push_config_args() == ["-c", "pack.threads=4"]
+
+        monkeypatch.setenv("OPENNEURO_STUDIES_PUSH_GIT_CONFIG", "")
+        assert _push_config_args() == []
 
 
 class TestSyncPublicationStatus:
     """Test sync_publication_status function."""
 
+    @staticmethod
+    def _graphql_page(*repos, end_cursor=None):
+        """Build a GraphQL organization repositories page from (name, sha) pairs."""
+        return {
+            "organization": {
+                "repositories": {
+                    "nodes": [
+                        {
+                            "name": name,
+                            "url": f"https://github.com/TestOrg/{name}",
+                            "defaultBranchRef": {"target": {"oid": sha}} if sha else None,
+                        }
+                        for name, sha in repos
+                    ],
+                    "pageInfo": {
+                        "hasNextPage": end_cursor is not None,
+                        "endCursor": end_cursor,
+                    },
+                }
+            }
+        }
+
     @pytest.mark.ai_generated
     def test_sync_add_new_study(self):
         """Test syncing when GitHub has new study not in local tracking."""
-        with patch("openneuro_studies.publishing.sync.Github") as mock_github:
-            mock_github_instance = Mock()
-            mock_github.return_value = mock_github_instance
-            mock_org = Mock()
-            mock_github_instance.get_organization.return_value = mock_org
-
+        with patch("openneuro_studies.publishing.sync.GitHubClient") as mock_client:
             # Mock GitHub repos
-            mock_repo = Mock()
-            mock_repo.name = "study-ds000001"
-            mock_repo.html_url = "https://github.com/TestOrg/study-ds000001"
-            mock_repo.default_branch = "main"
-            mock_branch = Mock()
-            mock_commit = Mock()
-            mock_commit.sha = "a" * 40
-            mock_branch.commit = mock_commit
-            mock_repo.get_branch.return_value = mock_branch
-            mock_org.get_repos.return_value = [mock_repo]
+            mock_client.return_value.graphql.return_value = self._graphql_page(
+                ("study-ds000001", "a" * 40)
+            )
 
             # Empty local status
             status = PublicationStatus(
@@ -333,18 +590,14 @@ class TestSyncPublicationStatus:
             assert result.added == 1
             assert "study-ds000001" in result.added_studies
             assert len(status.studies) == 1
+            assert status.studies[0].github_url == "https://github.com/TestOrg/study-ds000001"
 
     @pytest.mark.ai_generated
     def test_sync_remove_deleted_study(self):
         """Test syncing when local tracking has study deleted from GitHub."""
-        with patch("openneuro_studies.publishing.sync.Github") as mock_github:
-            mock_github_instance = Mock()
-            mock_github.return_value = mock_github_instance
-            mock_org = Mock()
-            mock_github_instance.get_organization.return_value = mock_org
-
+        with patch("openneuro_studies.publishing.sync.GitHubClient") as mock_client:
             # Empty GitHub repos
-            mock_org.get_repos.return_value = []
+            mock_client.return_value.graphql.return_value = self._graphql_page()
 
             # Local status has a study
             status = PublicationStatus(
@@ -367,23 +620,11 @@ class TestSyncPublicationStatus:
     @pytest.mark.ai_generated
     def test_sync_update_commit_sha(self):
         """Test syncing when commit SHA differs between local and GitHub."""
-        with patch("openneuro_studies.publishing.sync.Github") as mock_github:
-            mock_github_instance = Mock()
-            mock_github.return_value = mock_github_instance
-            mock_org = Mock()
-            mock_github_instance.get_organization.return_value = mock_org
-
+        with patch("openneuro_studies.publishing.sync.GitHubClient") as mock_client:
             # Mock GitHub repos with new SHA
-            mock_repo = Mock()
-            mock_repo.name = "study-ds000001"
-            mock_repo.html_url = "https://github.com/TestOrg/study-ds000001"
-            mock_repo.default_branch = "main"
-            mock_branch = Mock()
-            mock_commit = Mock()
-            mock_commit.sha = "b" * 40  # New SHA
-            mock_branch.commit = mock_commit
-            mock_repo.get_branch.return_value = mock_branch
-            mock_org.get_repos.return_value = [mock_repo]
+            mock_client.return_value.graphql.return_value = self._graphql_page(
+                ("study-ds000001", "b" * 40)
+            )
 
             # Local status has old SHA
             status = PublicationStatus(
@@ -406,6 +647,51 @@ class TestSyncPublicationStatus:
             assert result.updated_studies[0][2] == "b" * 40  # New
             assert status.studies[0].last_push_commit_sha == "b" * 40
 
+    @pytest.mark.ai_generated
+    def test_sync_paginates_and_skips_empty_repos(self):
+        """Test following GraphQL pages, skipping non-study repos and repos without commits."""
+        with patch("openneuro_studies.publishing.sync.GitHubClient") as mock_client:
+            graphql = mock_client.return_value.graphql
+            graphql.side_effect = [
+                self._graphql_page(
+                    ("study-ds000001", "a" * 40),
+                    ("other-repo", "c" * 40),
+                    ("study-scratch", "d" * 40),
+                    end_cursor="page2",
+                ),
+                self._graphql_page(("study-ds000002", None), ("study-ds000003", "b" * 40)),
+            ]
+
+            status = PublicationStatus(
+                studies=[], organization="TestOrg", last_updated=datetime.utcnow()
+            )
+
+            result = sync_publication_status("fake-token", "TestOrg", status)
+            assert result.added_studies == ["study-ds000001", "study-ds000003"]
+            assert graphql.call_count == 2
+            assert graphql.call_args.args[1] == {"org": "TestOrg", "cursor": "page2"}
+
+    @pytest.mark.ai_generated
+    def test_sync_stops_once_expected_names_seen(self):
+        """Test that listing stops after the page covering all expected studies."""
+        with patch("openneuro_studies.publishing.sync.GitHubClient") as mock_client:
+            graphql = mock_client.return_value.graphql
+            graphql.side_effect = [
+                self._graphql_page(("study-ds000001", "a" * 40), end_cursor="page2"),
+                self._graphql_page(("study-ds000002", "b" * 40), end_cursor="page3"),
+                self._graphql_page(("study-ds000003", "c" * 40)),
+            ]
+
+            status = PublicationStatus(
+                studies=[], organization="TestOrg", last_updated=datetime.utcnow()
+            )
+
+            result = sync_publication_status(
+                "fake-token", "TestOrg", status, expected_names={"study-ds000002"}
+            )
+            assert graphql.call_count == 2
+            assert result.added_studies == ["study-ds000001", "study-ds000002"]
+
 
 class TestSyncResult:
     """Test SyncResult class."""
@@ -434,3 +720,81 @@ class TestSyncResult:
         assert "study-ds000001" in output
         assert "study-ds000002" in output
         assert "study-ds000003" in output
+
+
+class TestPublishCLI:
+    """Test the publish CLI command."""
+
+    @pytest.mark.ai_generated
+    def test_parallel_workers_preserve_order(self, tmp_path, monkeypatch):
+        """Test that --workers publishes every study and reports in input order."""
+        from click.testing import CliRunner
+
+        from openneuro_studies.cli.main import cli
+
+        for study_id in ("study-ds000001", "study-ds000002", "study-ds000003"):
+            (tmp_path / study_id).mkdir()
+        monkeypatch.chdir(tmp_path)
+
+        def fake_publish(study_path, force=False, local_sha=None):
+            return (f"https://github.com/TestOrg/{study_path.name}", "a" * 40, True)
+
+        with (
+            patch("openneuro_studies.cli.publish.GitHubPublisher") as mock_publisher,
+            patch.object(PublicationTracker, "save") as mock_save,
+        ):
+            mock_publisher.return_value.publish_study.side_effect = fake_publish
+            result = CliRunner().invoke(
+                cli,
+                [
+                    "publish",
+                    "--token",
+                    "fake-token",
+                    "--workers",
+                    "3",
+                    "study-ds000003",
+                    "study-ds000001",
+                    "study-ds000002",
+                ],
+            )
+
+        assert result.exit_code == 0, result.output
+        assert mock_publisher.return_value.publish_study.call_count == 3
+        positions = [
+            result.output.index(f"Publishing {study_id}...")
+            for study_id in ("study-ds000003", "study-ds000001", "study-ds000002")
+        ]
+        assert positions == sorted(positions)
+        assert "Created: 3 new repositories" in result.output
+        mock_save.assert_called_once_with(commit=True)
+
+    @pytest.mark.ai_generated
+    def test_workers_read_tracking_snapshot(self, tmp_path, monkeypatch):
+        """Test that workers skip up-to-date studies without reading the live tracker."""
+        from click.testing import CliRunner
+
+        from openneuro_studies.cli.main import cli
+
+        for study_id in ("study-ds000001", "study-ds000002"):
+            (tmp_path / study_id).mkdir()
+        monkeypatch.chdir(tmp_path)
+        tracker = PublicationTracker(tmp_path / ".openneuro-studies")
+        tracker.mark_published("study-ds000001", "https://github.com/TestOrg/x", "a" * 40)
+        tracker.save(commit=False)
+
+        def fake_publish(study_path, force=False, local_sha=None):
+            return (f"https://github.com/TestOrg/{study_path.name}", "b" * 40, True)
+
+        with (
+            patch("openneuro_studies.cli.publish.GitHubPublisher") as mock_publisher,
+            patch.object(PublicationTracker, "save"),
+            patch.object(PublicationTracker, "is_published", side_effect=AssertionError),
+        ):
+            mock_publisher.return_value.get_local_head_sha.return_value = "a" * 40
+            mock_publisher.return_value.get_remote_head_sha.return_value = "a" * 40
+            mock_publisher.return_value.publish_study.side_effect = fake_publish
+            result = CliRunner().invoke(cli, ["publish", "--token", "fake-token", "--workers", "2"])
+
+        assert result.exit_code == 0, result.output
+        assert "study-ds000001... already up-to-date" in result.output
+        mock_publisher.return_value.publish_study.assert_called_once()
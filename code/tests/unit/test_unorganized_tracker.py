@@ -5,14 +5,22 @@ from pathlib import Path
 import pytest
 
 from openneuro_studies.models import DerivativeDataset, UnorganizedDataset, UnorganizedReason
+from openneuro_studies.organization import unorganized_tracker
 from openneuro_studies.organization.unorganized_tracker import (
     add_unorganized_dataset,
+    flush_unorganized_commits,
     get_unorganized_summary,
     load_unorganized_datasets,
     save_unorganized_datasets,
 )
 
 
+@pytest.fixture(autouse=True)
+def _isolated_pending_saves(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Give each test its own set of deferred saves, so none leak between tests."""
+    monkeypatch.setattr(unorganized_tracker, "_PENDING_SAVES", set())
+
+
 @pytest.mark.unit
 @pytest.mark.ai_generated
 def test_save_and_load_unorganized_datasets(tmp_path: Path) -> None:
@@ -89,6 +97,84 @@ def test_add_unorganized_dataset(tmp_path: Path) -> None:
     assert len(loaded) == 2
 
 
+@pytest.mark.unit
+@pytest.mark.ai_generated
+def test_add_unorganized_dataset_keeps_sorted_order(tmp_path: Path) -> None:
+    """Test that adding to existing entries keeps deterministic order (FR-038)."""
+    config_dir = tmp_path / ".openneuro-studies"
+
+    for dataset_id in ("ds000300", "ds000100", "ds000200"):
+        add_unorganized_dataset(
+            UnorganizedDataset(
+                dataset_id=dataset_id,
+                url=f"https://github.com/OpenNeuroDerivatives/{dataset_id}-fmriprep",
+                commit_sha="a" * 40,
+                reason=UnorganizedReason.ORGANIZATION_ERROR,
+                discovered_at="2025-10-13T10:00:00",
+            ),
+            config_dir,
+            defer_commit=True,
+        )
+
+    loaded = load_unorganized_datasets(config_dir)
+    assert [u.dataset_id for u in loaded] == ["ds000100", "ds000200", "ds000300"]
+
+
+@pytest.mark.unit
+@pytest.mark.ai_generated
+def test_deferred_commits_flushed_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that deferred saves are committed by a single flush."""
+    config_dir = tmp_path / ".openneuro-studies"
+    calls = []
+    monkeypatch.setattr(unorganized_tracker.dl, "save", lambda **kwargs: calls.append(kwargs))
+
+    for i in range(3):
+        add_unorganized_dataset(
+            UnorganizedDataset(
+                dataset_id=f"ds00021{i}",
+                url=f"https://github.com/OpenNeuroDerivatives/ds00021{i}-fmriprep",
+                commit_sha="a" * 40,
+                reason=UnorganizedReason.ORGANIZATION_ERROR,
+                discovered_at="2025-10-13T10:00:00",
+            ),
+            config_dir,
+            defer_commit=True,
+        )
+    assert calls == []
+
+    flush_unorganized_commits()
+    assert len(calls) == 1
+    assert calls[0]["path"] == [str((config_dir / "unorganized-datasets.json").resolve())]
+
+    # Nothing pending after flush
+    flush_unorganized_commits()
+    assert len(calls) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.ai_generated
+def test_save_unchanged_skips_commit(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that saving identical content neither rewrites nor commits."""
+    config_dir = tmp_path / ".openneuro-studies"
+    calls = []
+    monkeypatch.setattr(unorganized_tracker.dl, "save", lambda **kwargs: calls.append(kwargs))
+
+    unorganized = UnorganizedDataset(
+        dataset_id="ds000212",
+        url="https://github.com/OpenNeuroDerivatives/ds000212-fmriprep",
+        commit_sha="a" * 40,
+        reason=UnorganizedReason.RAW_DATASET_NOT_FOUND,
+        discovered_at="2025-10-13T10:00:00",
+    )
+    save_unorganized_datasets([unorganized], config_dir)
+    assert len(calls) == 1
+    mtime = (config_dir / "unorganized-datasets.json").stat().st_mtime_ns
+
+    save_unorganized_datasets([unorganized], config_dir)
+    assert len(calls) == 1
+    assert (config_dir / "unorganized-datasets.json").stat().st_mtime_ns == mtime
+
+
 @pytest.mark.unit
 @pytest.mark.ai_generated
 def test_get_unorganized_summary(tmp_path: Path) -> None:
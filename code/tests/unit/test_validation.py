@@ -0,0 +1,428 @@
+"""Unit tests for BIDS validation helpers."""
+
+import json
+import subprocess
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from openneuro_studies.validation import (
+    ValidationCache,
+    ValidationResult,
+    ValidationStatus,
+    find_validator,
+    get_validator_version,
+    needs_validation,
+    run_validation,
+    run_validation_batch,
+    study_content_key,
+    update_studies_tsv_validation,
+    update_studies_tsv_validation_bulk,
+)
+from openneuro_studies.validation.bids_validator import _query_validator_version
+
+
+@pytest.fixture(autouse=True)
+def _clear_validator_caches():
+    """Validator lookups are cached per process; start each test afresh."""
+    find_validator.cache_clear()
+    _query_validator_version.cache_clear()
+    yield
+    find_validator.cache_clear()
+    _query_validator_version.cache_clear()
+
+
+class TestRunValidationBatch:
+    """Test validating several studies at once."""
+
+    @pytest.mark.unit
+    @pytest.mark.ai_generated
+    def test_results_in_input_order_with_overlap(self, tmp_path: Path) -> None:
+        """Test that validations overlap but results come back in study order."""
+        study_paths = [tmp_path / f"study-ds00000{i}" for i in range(1, 4)]
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def fake_run_validation(study_path, validator_cmd=None, timeout=600, native_text=False):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            # Earlier studies finish last
+            time.sleep(0.05 * (4 - int(study_path.name[-1])))
+            with lock:
+                running -= 1
+            return ValidationResult(status=ValidationStatus.VALID, error_count=0, warning_count=0)
+
+        with patch(
+            "openneuro_studies.validation.bids_validator.run_validation",
+            side_effect=fake_run_validation,
+        ) as mock_run:
+            results = list(
+                run_validation_batch(study_paths, validator_cmd=["validator"], max_workers=3)
+            )
+
+        assert [path for path, _ in results] == study_paths
+        assert peak > 1
+        assert all(call.kwargs["validator_cmd"] == ["validator"] for call in mock_run.mock_calls)
+
+    @pytest.mark.unit
+    @pytest.mark.ai_generated
+    def test_validator_detected_once(self, tmp_path: Path) -> None:
+        """Test that the validator is looked up once for the whole batch."""
+        study_paths = [tmp_path / "study-ds000001", tmp_path / "study-ds000002"]
+        result = ValidationResult(status=ValidationStatus.VALID, error_count=0, warning_count=0)
+
+        with (
+            patch(
+                "openneuro_studies.validation.bids_validator.find_validator",
+                return_value=(["uvx", "bids-validator-deno"], "uvx"),
+            ) as mock_find,
+            patch(
+                "openneuro_studies.validation.bids_validator.run_validation", return_value=result
+            ) as mock_run,
+        ):
+            dict(run_validation_batch(study_paths))
+
+        mock_find.assert_called_once()
+        assert mock_run.call_count == 2
+        assert mock_run.call_args.kwargs["validator_cmd"] == ["uvx", "bids-validator-deno"]
+
+
+class TestUpdateStudiesTsvValidation:
+    """Test writing validation status into studies.tsv."""
+
+    @staticmethod
+    def _write_tsv(path: Path) -> None:
+        path.write_text(
+            "study_id\tname\tbids_valid\n"
+            "study-ds000001\tA\tn/a\n"
+            "study-ds000002\tB\tn/a\n"
+            "study-ds000003\tC\tn/a\n"
+        )
+
+    @pytest.mark.unit
+    @pytest.mark.ai_generated
+    def test_bulk_update(self, tmp_path: Path) -> None:
+        """Test that all statuses land in one pass and unknown study IDs are skipped."""
+        tsv = tmp_path / "studies.tsv"
+        self._write_tsv(tsv)
+
+        update_studies_tsv_validation_bulk(
+            tsv,
+            {
+                "study-ds000001": ValidationStatus.VALID,
+                "study-ds000003": ValidationStatus.ERRORS,
+                "study-ds999999": ValidationStatus.WARNINGS,
+            },
+        )
+        assert tsv.read_text().splitlines() == [
+            "study_id\tname\tbids_valid",
+            "study-ds000001\tA\tvalid",
+            "study-ds000002\tB\tn/a",
+            "study-ds000003\tC\terrors",
+        ]
+
+    @pytest.mark.unit
+    @pytest.mark.ai_generated
+    def test_failed_write_leaves_tsv_intact(self, tmp_path: Path) -> None:
+        """Test that a failure while writing keeps the old file and no temp file."""
+        tsv = tmp_path / "studies.tsv"
+        self._write_tsv(tsv)
+        before = tsv.read_text()
+
+        with patch("openneuro_studies.validation.bids_validator.csv.writer") as mock_writer:
+            mock_writer.return_value.writerows.side_effect = OSError("disk full")
+            with pytest.raises(OSError, match="disk full"):
+                update_studies_tsv_validation_bulk(tsv, {"study-ds000001": ValidationStatus.VALID})
+
+        assert tsv.read_text() == before
+        assert [p.name for p in tmp_path.iterdir()] == ["studies.tsv"]
+
+    @pytest.mark.unit
+    @pytest.mark.ai_generated
+    def test_single_update(self, tmp_path: Path) -> None:
+        """Test that the per-study update still works."""
+        tsv = tmp_path / "studies.tsv"
+        self._write_tsv(tsv)
+
+        update_studies_tsv_validation(tsv, "study-ds000002", ValidationStatus.WARNINGS)
+
+        assert "study-ds000002\tB\twarnings" in tsv.read_text().splitlines()
+
+
+class TestRunValidation:
+    """Test running the validator on one study."""
+
+    @pytest.mark.unit
+    @pytest.mark.ai_generated
+    def test_report_json_is_validator_stdout(self, tmp_path: Path) -> None:
+        """Test that report.json holds the validator's --json output verbatim."""
+        study_path = tmp_path / "study-ds000001"
+        study_path.mkdir()
+        report = '{"issues": {"errors": [], "warnings": [{"code": "W", "reason": "Odd"}]}}\n'
+
+        with patch(
+            "openneuro_studies.validation.bids_validator.subprocess.run",
+            side_effect=self._fake_run(report),
+        ) as mock_run:
+            result = run_validation(study_path, validator_cmd=["validator"])
+
+        output_dir = study_path / "derivatives" / "bids-validator"
+        assert (output_dir / "report.json").read_text() == report
+        assert (output_dir / "version.txt").read_text() == "2.0.0\n"
+        assert result.status == ValidationStatus.WARNINGS
+        assert result.warning_count == 1
+        assert sorted(p.name for p in output_dir.iterdir()) == [
+            "report.json",
+            "report.txt",
+            "version.txt",
+        ]
+
+        # report.txt is formatted from the JSON: the validator ran only once
+        text = (output_dir / "report.txt").read_text()
+        assert "  [W] Odd\n" in text
+        assert text.endswith("0 errors, 1 warnings\n")
+        assert [c.args[0][-1] for c in mock_run.call_args_list] == ["--version", "--json"]
+
+    @pytest.mark.unit
+    @pytest.mark.ai_generated
+    def test_native_text_runs_validator_again(self, tmp_path: Path) -> None:
+        """Test that native_text keeps the validator's own text output as report.txt."""
+        study_path = tmp_path / "study-ds000001"
+        study_path.mkdir()
+
+        with patch(
+            "openneuro_studies.validation.bids_validator.subprocess.run",
+            side_effect=self._fake_run('{"issues": {"errors": [], "warnings": []}}'),
+        ):
+            run_validation(study_path, validator_cmd=["validator"], native_text=True)
+
+        output_dir = study_path / "derivatives" / "bids-validator"
+        assert (output_dir / "report.txt").read_text() == "native text\n"
+
+    @pytest.mark.unit
+    @pytest.mark.ai_generated
+    def test_deno_report_layout(self, tmp_path: Path) -> None:
+        """Test counting and formatting the deno validator's issues.issues layout."""
+        study_path = tmp_path / "study-ds000001"
+        study_path.mkdir()
+        report = json.dumps(
+            {
+                "issues": {
+                    "issues": [
+                        {"code": "E1", "severity": "error", "location": "/sub-01/x.nii"},
+                        {"code": "W1", "severity": "warning", "issueMessage": "Hm"},
+                        {"code": "W1", "severity": "warning"},
+                        {"code": "I1", "severity": "ignore"},
+                    ],
+                    "codeMessages": {"E1": "Broken\nfile", "W1": "Generic"},
+                }
+            }
+        )
+
+        with patch(
+            "openneuro_studies.validation.bids_validator.subprocess.run",
+            side_effect=self._fake_run(report),
+        ):
+            result = run_validation(study_path, validator_cmd=["validator"])
+
+        assert result.status == ValidationStatus.ERRORS
+        assert (result.error_count, result.warning_count) == (1, 2)
+        text = result.text_output or ""
+        assert "  [E1] Broken file\n      /sub-01/x.nii\n" in text
+        assert "  [W1] Hm\n" in text
+        assert "  [W1] Generic\n" in text
+        assert "I1" not in text
+
+    @staticmethod
+    def _fake_run(report: str):
+        def fake_run(cmd, **kwargs):
+            if "--version" in cmd:
+                return subprocess.CompletedProcess(cmd, 0, stdout="2.0.0\n", stderr="")
+            if "--json" in cmd:
+                kwargs["stdout"].write(report.encode())
+                return subprocess.CompletedProcess(cmd, 0)
+            return subprocess.CompletedProcess(cmd, 0, stdout="native text\n", stderr="")
+
+        return fake_run
+
+    @pytest.mark.unit
+    @pytest.mark.ai_generated
+    def test_unparsable_json_keeps_previous_report(self, tmp_path: Path) -> None:
+        """Test that output that is not JSON does not replace an existing report.json."""
+        study_path = tmp_path / "study-ds000001"
+        output_dir = study_path / "derivatives" / "bids-validator"
+        output_dir.mkdir(parents=True)
+        (output_dir / "report.json").write_text('{"issues": {}}')
+
+        def fake_run(cmd, **kwargs):
+            if "--json" in cmd:
+                kwargs["stdout"].write(b"Error: crashed\n")
+                return subprocess.CompletedProcess(cmd, 1)
+            return subprocess.CompletedProcess(cmd, 1, stdout="", stderr="crashed\n")
+
+        with patch(
+            "openneuro_studies.validation.bids_validator.subprocess.run", side_effect=fake_run
+        ):
+            result = run_validation(study_path, validator_cmd=["validator"])
+
+        assert (output_dir / "report.json").read_text() == '{"issues": {}}'
+        assert not (output_dir / "report.json.partial").exists()
+        assert result.status == ValidationStatus.NOT_AVAILABLE
+
+
+class TestValidatorLookup:
+    """Test locating the validator and querying its version."""
+
+    @pytest.mark.unit
+    @pytest.mark.ai_generated
+    def test_find_validator_is_cached(self) -> None:
+        """Test that PATH is searched once across repeated lookups."""
+        with patch(
+            "openneuro_studies.validation.bids_validator.shutil.which",
+            side_effect=lambda name: "/usr/bin/uvx" if name == "uvx" else None,
+        ) as mock_which:
+            assert find_validator() == (["/usr/bin/uvx", "bids-validator-deno"], "uvx")
+            assert find_validator() == (["/usr/bin/uvx", "bids-validator-deno"], "uvx")
+        assert mock_which.call_count == 1
+
+    @pytest.mark.unit
+    @pytest.mark.ai_generated
+    def test_version_cached_only_on_success(self) -> None:
+        """Test that a failed --version is retried but a successful one is reused."""
+        outcomes = [
+            subprocess.CalledProcessError(1, ["validator", "--version"]),
+            subprocess.CompletedProcess(["validator", "--version"], 0, stdout="2.0.0\n"),
+        ]
+        with patch(
+            "openneuro_studies.validation.bids_validator.subprocess.run", side_effect=outcomes
+        ) as mock_run:
+            assert get_validator_version(["validator"]) is None
+            assert get_validator_version(["validator"]) == "2.0.0"
+            assert get_validator_version(["validator"]) == "2.0.0"
+        assert mock_run.call_count == 2
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def study_repo(tmp_path: Path) -> Path:
+    """A committed study with existing validation output."""
+    study_path = tmp_path / "study-ds000001"
+    (study_path / "derivatives" / "bids-validator").mkdir(parents=True)
+    (study_path / "dataset_description.json").write_text("{}")
+    (study_path / "derivatives" / "bids-validator" / "version.txt").write_text("2.0.0\n")
+    _git(study_path, "init", "-q")
+    _git(study_path, "add", ".")
+    _git(study_path, "commit", "-q", "-m", "initial")
+    return study_path
+
+
+class TestValidationCache:
+    """Test deciding revalidation from cached study content keys."""
+
+    @pytest.mark.unit
+    @pytest.mark.ai_generated
+    def test_content_key_ignores_validator_output(self, study_repo: Path) -> None:
+        """Test that committing validation results does not change the content key."""
+        key = study_content_key(study_repo)
+        assert key is not None
+
+        (study_repo / "derivatives" / "bids-validator" / "report.json").write_text("{}")
+        _git(study_repo, "add", ".")
+        _git(study_repo, "commit", "-q", "-m", "validation")
+        assert study_content_key(study_repo) == key
+
+        (study_repo / "README").write_text("changed")
+        _git(study_repo, "add", ".")
+        _git(study_repo, "commit", "-q", "-m", "content")
+        assert study_content_key(study_repo) != key
+
+    @pytest.mark.unit
+    @pytest.mark.ai_generated
+    def test_content_key_same_with_pygit2_and_git(self, study_repo: Path) -> None:
+        """Test that the in-process tree listing matches git ls-tree."""
+        pytest.importorskip("pygit2")
+        (study_repo / "derivatives" / "mriqc").mkdir()
+        (study_repo / "derivatives" / "mriqc" / "x.tsv").write_text("x")
+        (study_repo / "sub-01").mkdir()
+        (study_repo / "sub-01" / "anat.nii").write_text("")
+        _git(study_repo, "add", ".")
+        _git(study_repo, "commit", "-q", "-m", "more")
+
+        key = study_content_key(study_repo)
+        with patch("openneuro_studies.validation.bids_validator.PYGIT2_AVAILABLE", False):
+            assert study_content_key(study_repo) == key
+
+    @pytest.mark.unit
+    @pytest.mark.ai_generated
+    def test_content_key_outside_git(self, tmp_path: Path) -> None:
+        """Test that a directory that is not a git repository has no key."""
+        assert study_content_key(tmp_path) is None
+
+    @pytest.mark.unit
+    @pytest.mark.ai_generated
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Test that recorded entries survive save and reload."""
+        cache_file = tmp_path / "cache" / "validation.json"
+        cache = ValidationCache(cache_file)
+        assert cache.is_current("study-ds000001", "abc", "2.0.0") is None
+
+        cache.record("study-ds000001", "abc", "2.0.0", ValidationStatus.VALID)
+        cache.save()
+
+        reloaded = ValidationCache(cache_file)
+        assert reloaded.is_current("study-ds000001", "abc", "2.0.0") is True
+        assert reloaded.is_current("study-ds000001", "def", "2.0.0") is False
+        assert reloaded.is_current("study-ds000001", "abc", "2.1.0") is False
+        assert json.loads(cache_file.read_text())["studies"]["study-ds000001"]["status"] == "valid"
+
+    @pytest.mark.unit
+    @pytest.mark.ai_generated
+    def test_unreadable_cache_is_empty(self, tmp_path: Path) -> None:
+        """Test that a corrupt cache file is ignored rather than fatal."""
+        cache_file = tmp_path / "validation.json"
+        cache_file.write_text("{not json")
+        assert ValidationCache(cache_file).is_current("study-ds000001", "abc") is None
+
+    @pytest.mark.unit
+    @pytest.mark.ai_generated
+    def test_needs_validation_uses_cache(self, study_repo: Path, tmp_path: Path) -> None:
+        """Test that a cache hit skips git history and a content change is noticed."""
+        cache = ValidationCache(tmp_path / "validation.json")
+        cache.record("study-ds000001", study_content_key(study_repo) or "", "2.0.0")
+
+        with patch(
+            "openneuro_studies.validation.bids_validator._needs_validation_from_history"
+        ) as mock_history:
+            assert not needs_validation(study_repo, cache=cache, validator_version="2.0.0")
+            assert needs_validation(study_repo, cache=cache, validator_version="2.1.0")
+        mock_history.assert_not_called()
+
+        (study_repo / "README").write_text("changed")
+        _git(study_repo, "add", ".")
+        _git(study_repo, "commit", "-q", "-m", "content")
+        assert needs_validation(study_repo, cache=cache, validator_version="2.0.0")
+
+    @pytest.mark.unit
+    @pytest.mark.ai_generated
+    def test_unknown_study_falls_back_to_history(self, study_repo: Path, tmp_path: Path) -> None:
+        """Test that a study missing from the cache is decided from git and then recorded."""
+        cache = ValidationCache(tmp_path / "validation.json")
+
+        assert not needs_validation(study_repo, cache=cache, validator_version="2.0.0")
+        key = study_content_key(study_repo)
+        assert key is not None
+        assert cache.is_current("study-ds000001", key, "2.0.0") is True